@@ -2,17 +2,52 @@
 Data Access Layer for Viral Movements Analyzer
 Provides key-value JSON format for filtering and accessing viral movements data
 """
+import csv
+import heapq
 import json
 import os
+import atexit
+import threading
+import weakref
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Callable, Iterator
 from dataclasses import dataclass, asdict
 import sqlite3
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; streaming falls back to a full load
+    ijson = None
+
 from monitoring.database import db_manager
 from monitoring.models import LogFilters, TimeRange, PerformanceMetrics
 
 
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, compact or 2-space indented, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(obj, option=option | orjson.OPT_INDENT_2 if indent else option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 @dataclass
 class MovementData:
     """Structured movement data model"""
@@ -36,22 +71,136 @@ class MovementData:
         return asdict(self)
 
 
+# JSON stores with a pending debounced save, flushed at interpreter exit
+_open_stores = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        store.flush()
+
+
+def _search_blob(movement: Dict[str, Any]) -> str:
+    """Lowercased title and transcript that keyword filters match against"""
+    return (movement["title"] + " " + movement["transcript"]).lower()
+
+
+def _filters_key(filters: Dict[str, Any]) -> Optional[tuple]:
+    """Hashable form of a filter dict for the result cache, or None if a value can't be hashed"""
+    try:
+        key = tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in filters.items()
+        ))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class _ColumnStore:
+    """
+    Parallel NumPy columns (struct-of-arrays) over the movement rows,
+    used to evaluate filters as vectorized boolean masks
+    """
+    
+    def __init__(self, movements: List[Dict[str, Any]], search_blobs: Dict[str, str]):
+        n = len(movements)
+        self.rows = movements
+        self.views = np.fromiter((m["views"] for m in movements), dtype=np.float64, count=n)
+        self.final_score = np.fromiter(
+            (m["scores"].get("final_score", 0) for m in movements), dtype=np.float64, count=n
+        )
+        self.growth_6h = np.fromiter((m["growth_6h"] for m in movements), dtype=np.float64, count=n)
+        self.age_hours = np.fromiter((m["age_hours"] for m in movements), dtype=np.float64, count=n)
+        self.platform = np.array([m["platform"] for m in movements], dtype=str)
+        # Lowercased title + transcript from the per-id cache, so rebuilding the
+        # columns after an insert only lowercases movements that are new
+        self.search_text = np.array(
+            [search_blobs.get(m["id"]) or search_blobs.setdefault(m["id"], _search_blob(m)) for m in movements],
+            dtype=str
+        )
+        self._sorted: Dict[str, tuple] = {}
+        self._by_score: Optional[tuple] = None
+        # Result row indices per filter set; dropped with the columns on any change
+        self.results: Dict[tuple, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def range_rows(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """
+        Row indices with low <= column <= high, found by binary search over a
+        sorted index of the column that is built on first use
+        """
+        if column not in self._sorted:
+            order = np.argsort(getattr(self, column), kind="stable")
+            self._sorted[column] = (order, getattr(self, column)[order])
+        order, values = self._sorted[column]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return order[start:stop]
+    
+    def score_slice(self, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """
+        Row indices with low <= final_score <= high, best first (ties in row order),
+        found by binary search over a descending score index built on first use
+        """
+        if self._by_score is None:
+            order = np.argsort(-self.final_score, kind="stable")
+            self._by_score = (order, -self.final_score[order])
+        order, neg_scores = self._by_score
+        start = 0 if high is None else np.searchsorted(neg_scores, -high, side="left")
+        stop = len(order) if low is None else np.searchsorted(neg_scores, -low, side="right")
+        return order[start:stop]
+
+
 class ViralMovementsDataAccess:
     """
     Data access layer for viral movements data with JSON key-value filtering
+    
+    Writes (add_movements, clear_data) update memory at once and reach the
+    data file FLUSH_DELAY seconds later, in one save per burst of writes.
+    Call flush() when the file must be current, e.g. before another process
+    reads it; pending saves are also flushed at interpreter exit.
     """
     
+    # Seconds a change may wait before it is written; writes inside the window share one save
+    FLUSH_DELAY = 0.5
+    
+    # Distinct filter sets whose results are kept until the movements change
+    RESULT_CACHE_SIZE = 128
+    
     def __init__(self, data_file: str = "viral_movements_data.json"):
         self.data_file = data_file
         self.data = self._load_data()
+        self._columns = None
+        self._search_blobs: Dict[str, str] = {}
+        # Subclasses that keep movements outside self.data start with an empty index
+        self._id_index: Dict[str, int] = {m["id"]: i for i, m in enumerate(self.data.get("movements", []))}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        _open_stores.add(self)
+    
+    def _invalidate_columns(self) -> None:
+        """Drop the columnar view after the movements list changes"""
+        self._columns = None
+    
+    def _get_columns(self) -> _ColumnStore:
+        """Get the columnar view, building it on first use after a load or change"""
+        if self._columns is None:
+            self._columns = _ColumnStore(self.data["movements"], self._search_blobs)
+        return self._columns
     
     def _load_data(self) -> Dict[str, Any]:
         """Load data from JSON file or create empty structure"""
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
+                with open(self.data_file, 'rb') as f:
+                    return _json_loads(f.read())
+            except (ValueError, FileNotFoundError):
                 pass
         
         # Return empty structure
@@ -71,49 +220,86 @@ class ViralMovementsDataAccess:
         }
     
     def _save_data(self) -> None:
-        """Save data to JSON file"""
+        """Save data to JSON file via an atomic temp-file swap"""
         self.data["metadata"]["last_updated"] = datetime.now().isoformat()
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        tmp_file = self.data_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(self.data))
+        os.replace(tmp_file, self.data_file)
     
-    def add_movements(self, movements: List[Dict[str, Any]]) -> None:
-        """Add new movements to the data store"""
-        for movement in movements:
-            # Ensure required structure
-            movement_data = {
-                "id": movement.get("id", ""),
-                "title": movement.get("title", ""),
-                "platform": movement.get("platform", "unknown"),
-                "views": movement.get("views", 0),
-                "views_last_24h": movement.get("views_last_24h", 0),
-                "likes": movement.get("likes", 0),
-                "comments": movement.get("comments", 0),
-                "shares": movement.get("shares", 0),
-                "age_hours": movement.get("age_hours", 0.0),
-                "growth_6h": movement.get("growth_6h", 0.0),
-                "transcript": movement.get("transcript", ""),
-                "thumbnail_url": movement.get("thumbnail_url", ""),
-                "url": movement.get("url", ""),
-                "scores": movement.get("scores", {}),
-                "metadata": {
-                    "processed_at": datetime.now().isoformat(),
-                    "niche_match": movement.get("niche_match", []),
-                    "reactability": movement.get("reactability", 0.0),
-                    **movement.get("metadata", {})
-                }
+    def _mark_dirty(self) -> None:
+        """Schedule a save, arming the flush timer if none is pending"""
+        with self._lock:
+            self._dirty = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """Write any pending changes to disk now"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._dirty = False
+                # Nothing to save into once the store's directory is gone (e.g. a removed temp dir)
+                if not os.path.isdir(os.path.dirname(os.path.abspath(self.data_file))):
+                    _open_stores.discard(self)
+                    return
+                self._save_data()
+    
+    @staticmethod
+    def _normalize_movement(movement: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure a raw movement dict has the full stored structure"""
+        return {
+            "id": movement.get("id", ""),
+            "title": movement.get("title", ""),
+            "platform": movement.get("platform", "unknown"),
+            "views": movement.get("views", 0),
+            "views_last_24h": movement.get("views_last_24h", 0),
+            "likes": movement.get("likes", 0),
+            "comments": movement.get("comments", 0),
+            "shares": movement.get("shares", 0),
+            "age_hours": movement.get("age_hours", 0.0),
+            "growth_6h": movement.get("growth_6h", 0.0),
+            "transcript": movement.get("transcript", ""),
+            "thumbnail_url": movement.get("thumbnail_url", ""),
+            "url": movement.get("url", ""),
+            "scores": movement.get("scores", {}),
+            "metadata": {
+                "processed_at": datetime.now().isoformat(),
+                "niche_match": movement.get("niche_match", []),
+                "reactability": movement.get("reactability", 0.0),
+                **movement.get("metadata", {})
             }
+        }
+    
+    def add_movements(self, movements: List[Dict[str, Any]]) -> None:
+        """Add new movements to the data store; saved to disk after FLUSH_DELAY or on flush()"""
+        with self._lock:
+            stored = self.data["movements"]
+            for movement in movements:
+                movement_data = self._normalize_movement(movement)
+                movement_id = movement_data["id"]
+                
+                # Replace an existing movement with the same ID in place, otherwise append
+                if movement_id in self._id_index:
+                    stored[self._id_index[movement_id]] = movement_data
+                else:
+                    self._id_index[movement_id] = len(stored)
+                    stored.append(movement_data)
+                
+                # Cache the keyword search text outside the stored dict
+                self._search_blobs[movement_id] = _search_blob(movement_data)
             
-            # Remove existing movement with same ID
-            self.data["movements"] = [c for c in self.data["movements"] if c["id"] != movement_data["id"]]
+            # Update summary
+            self.data["summary"]["total_movements"] = len(self.data["movements"])
+            self.data["summary"]["timestamp"] = datetime.now().isoformat()
             
-            # Add new movement
-            self.data["movements"].append(movement_data)
-        
-        # Update summary
-        self.data["summary"]["total_movements"] = len(self.data["movements"])
-        self.data["summary"]["timestamp"] = datetime.now().isoformat()
-        
-        self._save_data()
+            self._invalidate_columns()
+            self._mark_dirty()
     
     def get_all_movements(self) -> List[Dict[str, Any]]:
         """Get all movements"""
@@ -134,50 +320,94 @@ class ViralMovementsDataAccess:
         - keywords: List[str] (search in title/transcript)
         - limit: int
         """
-        movements = self.data["movements"].copy()
+        cols = self._get_columns()
+        key = _filters_key(filters)
+        indices = cols.results.get(key) if key is not None else None
+        if indices is None:
+            indices = self._filter_indices(cols, filters)
+            if key is not None:
+                if len(cols.results) >= self.RESULT_CACHE_SIZE:
+                    cols.results.clear()
+                cols.results[key] = indices
+        return [cols.rows[i] for i in indices]
+    
+    def _filter_indices(self, cols: _ColumnStore, filters: Dict[str, Any]) -> np.ndarray:
+        """Row indices matching filters, best score first and cut to the limit"""
+        limit = filters.get("limit")
+        
+        # Score range and top-K alone are a slice of the descending score index
+        if filters.keys() <= {"min_score", "max_score", "limit"}:
+            return cols.score_slice(filters.get("min_score"), filters.get("max_score"))[:limit]
+        
+        # Start from the narrowest range filter's sorted-index slice, so the
+        # remaining filters only scan candidate rows
+        ranges = [
+            (column, filters.get(low), filters.get(high))
+            for column, low, high in (
+                ("views", "min_views", "max_views"),
+                ("final_score", "min_score", "max_score"),
+                ("growth_6h", "min_growth", None),
+                ("age_hours", None, "max_age_hours"),
+            )
+            if low in filters or high in filters
+        ]
+        if ranges:
+            indices = np.sort(min((cols.range_rows(*r) for r in ranges), key=len))
+        else:
+            indices = np.arange(len(cols))
+        mask = np.ones(len(indices), dtype=bool)
         
         # Platform filter
         if "platform" in filters:
-            movements = [c for c in movements if c["platform"] == filters["platform"]]
+            mask &= cols.platform[indices] == filters["platform"]
         
         # Views filters
         if "min_views" in filters:
-            movements = [c for c in movements if c["views"] >= filters["min_views"]]
+            mask &= cols.views[indices] >= filters["min_views"]
         if "max_views" in filters:
-            movements = [c for c in movements if c["views"] <= filters["max_views"]]
+            mask &= cols.views[indices] <= filters["max_views"]
         
         # Score filters
         if "min_score" in filters:
-            movements = [c for c in movements if c["scores"].get("final_score", 0) >= filters["min_score"]]
+            mask &= cols.final_score[indices] >= filters["min_score"]
         if "max_score" in filters:
-            movements = [c for c in movements if c["scores"].get("final_score", 0) <= filters["max_score"]]
+            mask &= cols.final_score[indices] <= filters["max_score"]
         
         # Growth filter
         if "min_growth" in filters:
-            movements = [c for c in movements if c["growth_6h"] >= filters["min_growth"]]
+            mask &= cols.growth_6h[indices] >= filters["min_growth"]
         
         # Age filter
         if "max_age_hours" in filters:
-            movements = [c for c in movements if c["age_hours"] <= filters["max_age_hours"]]
+            mask &= cols.age_hours[indices] <= filters["max_age_hours"]
         
         # Keyword search
         if "keywords" in filters:
-            keywords = [k.lower() for k in filters["keywords"]]
-            filtered_movements = []
-            for movement in movements:
-                text = (movement["title"] + " " + movement["transcript"]).lower()
-                if any(keyword in text for keyword in keywords):
-                    filtered_movements.append(movement)
-            movements = filtered_movements
+            text = cols.search_text[indices]
+            hits = np.zeros(len(indices), dtype=bool)
+            for keyword in filters["keywords"]:
+                hits |= np.char.find(text, keyword.lower()) >= 0
+            mask &= hits
+        
+        indices = indices[mask]
+        scores = cols.final_score[indices]
+        
+        # Partial selection of the top-K before sorting when a limit is given
+        if limit is not None and 0 < limit < len(indices):
+            cutoff = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            above = np.flatnonzero(scores > cutoff)
+            ties = np.flatnonzero(scores == cutoff)[:limit - len(above)]
+            top = np.sort(np.concatenate((above, ties)))
+            indices, scores = indices[top], scores[top]
         
-        # Sort by score (highest first)
-        movements.sort(key=lambda x: x["scores"].get("final_score", 0), reverse=True)
+        # Sort by score (highest first), stable for equal scores
+        indices = indices[np.argsort(-scores, kind="stable")]
         
         # Limit results
-        if "limit" in filters:
-            movements = movements[:filters["limit"]]
+        if limit is not None:
+            indices = indices[:limit]
         
-        return movements
+        return indices
     
     def get_movements_by_score(self, min_score: float = 0, max_score: float = 100, limit: int = None) -> List[Dict[str, Any]]:
         """Get movements filtered by score range"""
@@ -210,27 +440,23 @@ class ViralMovementsDataAccess:
         if not movements:
             return self.data["summary"]
         
-        # Calculate statistics
-        scores = [c["scores"].get("final_score", 0) for c in movements]
-        views = [c["views"] for c in movements]
-        platforms = {}
-        
-        for movement in movements:
-            platform = movement["platform"]
-            platforms[platform] = platforms.get(platform, 0) + 1
+        # Calculate statistics in one vectorized block over the cached columns
+        cols = self._get_columns()
+        scores, views = cols.final_score, cols.views
         
         summary = {
             **self.data["summary"],
             "statistics": {
                 "total_movements": len(movements),
-                "avg_score": sum(scores) / len(scores) if scores else 0,
-                "max_score": max(scores) if scores else 0,
-                "min_score": min(scores) if scores else 0,
-                "avg_views": sum(views) / len(views) if views else 0,
-                "max_views": max(views) if views else 0,
-                "platforms": platforms,
-                "high_score_movements": len([s for s in scores if s >= 15]),
-                "trending_movements": len([c for c in movements if c["growth_6h"] >= 3.0])
+                "avg_score": float(scores.mean()),
+                # Report extremes from the source rows so stored ints stay ints
+                "max_score": movements[int(scores.argmax())]["scores"].get("final_score", 0),
+                "min_score": movements[int(scores.argmin())]["scores"].get("final_score", 0),
+                "avg_views": float(views.mean()),
+                "max_views": movements[int(views.argmax())]["views"],
+                "platforms": dict(Counter(cols.platform.tolist())),
+                "high_score_movements": int(np.count_nonzero(scores >= 15)),
+                "trending_movements": int(np.count_nonzero(cols.growth_6h >= 3.0))
             }
         }
         
@@ -249,12 +475,10 @@ class ViralMovementsDataAccess:
                     "filters_applied": filters or {}
                 }
                 
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
+                with open(filename, 'wb') as f:
+                    f.write(_json_dumps(export_data, indent=True))
             
             elif format.lower() == "csv":
-                import pandas as pd
-                
                 # Flatten movement data for CSV
                 flattened_movements = []
                 for movement in movements:
@@ -271,8 +495,12 @@ class ViralMovementsDataAccess:
                     flat_movement.pop("metadata", None)
                     flattened_movements.append(flat_movement)
                 
-                df = pd.DataFrame(flattened_movements)
-                df.to_csv(filename, index=False)
+                # Header is the union of row keys, in first-seen order
+                fieldnames = list(dict.fromkeys(key for row in flattened_movements for key in row))
+                with open(filename, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(flattened_movements)
             
             return True
             
@@ -284,24 +512,24 @@ class ViralMovementsDataAccess:
         """Get performance metrics from monitoring system"""
         try:
             # Get recent performance data
-            time_range = TimeRange(
-                start=datetime.now() - timedelta(hours=24),
-                end=datetime.now()
-            )
+            now = datetime.now()
+            time_range = TimeRange(start=now - timedelta(hours=24), end=now)
             
-            metrics = db_manager.query_performance_metrics(time_range)
+            # Aggregated per function in SQL; only one row per function comes back
+            per_function = db_manager.query_performance_stats(time_range)
             
-            if not metrics:
+            if not per_function:
                 return {"error": "No performance data available"}
             
             # Calculate summary statistics
-            total_time = sum(m.execution_time for m in metrics)
-            avg_time = total_time / len(metrics)
-            avg_memory = sum(m.memory_peak for m in metrics) / len(metrics) / 1024 / 1024  # MB
+            executions = sum(row["calls"] for row in per_function)
+            total_time = sum(row["total_time"] for row in per_function)
+            avg_time = total_time / executions
+            avg_memory = sum(row["total_memory"] for row in per_function) / executions / 1024 / 1024  # MB
             
             function_stats = {}
-            for metric in metrics:
-                func_name = metric.function_name.split('.')[-1]
+            for row in per_function:
+                func_name = row["function_name"].split('.')[-1]
                 if func_name not in function_stats:
                     function_stats[func_name] = {
                         "calls": 0,
@@ -310,11 +538,11 @@ class ViralMovementsDataAccess:
                         "max_time": 0
                     }
                 
-                function_stats[func_name]["calls"] += 1
-                function_stats[func_name]["total_time"] += metric.execution_time
+                function_stats[func_name]["calls"] += row["calls"]
+                function_stats[func_name]["total_time"] += row["total_time"]
                 function_stats[func_name]["max_time"] = max(
                     function_stats[func_name]["max_time"], 
-                    metric.execution_time
+                    row["max_time"]
                 )
             
             # Calculate averages
@@ -324,7 +552,7 @@ class ViralMovementsDataAccess:
             
             return {
                 "summary": {
-                    "total_executions": len(metrics),
+                    "total_executions": executions,
                     "total_time": round(total_time, 3),
                     "avg_execution_time": round(avg_time, 3),
                     "avg_memory_mb": round(avg_memory, 1),
@@ -340,55 +568,114 @@ class ViralMovementsDataAccess:
             return {"error": f"Failed to get performance data: {str(e)}"}
     
     def export_clips(self, filename: str, format: str = "json", filters: Dict = None) -> bool:
-        """Export clips to file"""
-        try:
-            clips = self.filter_clips(**(filters or {}))
-            
-            if format.lower() == "json":
-                export_data = {
-                    "clips": clips,
-                    "summary": self.get_summary(),
-                    "exported_at": datetime.now().isoformat(),
-                    "filters_applied": filters or {}
-                }
-                
-                with open(filename, 'w') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
-            
-            elif format.lower() == "csv":
-                import pandas as pd
-                
-                # Flatten clip data for CSV
-                flattened_clips = []
-                for clip in clips:
-                    flat_clip = {
-                        **clip,
-                        "final_score": clip["scores"].get("final_score", 0),
-                        "virality_score": clip["scores"].get("virality", 0),
-                        "relevance_score": clip["scores"].get("relevance", 0),
-                        "processed_at": clip["metadata"].get("processed_at", ""),
-                        "reactability": clip["metadata"].get("reactability", 0)
-                    }
-                    # Remove nested objects
-                    flat_clip.pop("scores", None)
-                    flat_clip.pop("metadata", None)
-                    flattened_clips.append(flat_clip)
-                
-                df = pd.DataFrame(flattened_clips)
-                df.to_csv(filename, index=False)
-            
-            return True
-            
-        except Exception as e:
-            print(f"Export failed: {e}")
-            return False
+        """Export clips to file (alias of export_movements)"""
+        return self.export_movements(filename, format, filters)
     
     def clear_data(self) -> None:
-        """Clear all movement data"""
-        self.data = {
-            "movements": [],
+        """Clear all movement data; saved to disk after FLUSH_DELAY or on flush()"""
+        with self._lock:
+            self.data = {
+                "movements": [],
+                "summary": {
+                    "total_movements": 0,
+                    "filtered_movements": 0,
+                    "processing_time": 0.0,
+                    "timestamp": datetime.now().isoformat()
+                },
+                "metadata": {
+                    "version": "1.0",
+                    "created_at": datetime.now().isoformat(),
+                    "last_updated": datetime.now().isoformat()
+                }
+            }
+            self._search_blobs.clear()
+            self._id_index.clear()
+            self._invalidate_columns()
+            self._mark_dirty()
+
+
+class SQLiteMovementsDataAccess(ViralMovementsDataAccess):
+    """
+    Data access layer that keeps movements in an indexed SQLite table.
+    
+    Inserts are incremental (no whole-file rewrite) and filters run as
+    parameterized SQL over indexed columns. The full movement dict is kept
+    as a JSON column so results round-trip like the JSON-backed store.
+    Keyword search goes through an FTS5 trigram index, which keeps the
+    case-insensitive substring semantics of the JSON-backed store.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS movements (
+            id TEXT PRIMARY KEY,
+            platform TEXT,
+            views INTEGER,
+            final_score REAL,
+            growth_6h REAL,
+            age_hours REAL,
+            title TEXT,
+            transcript TEXT,
+            json BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_movements_platform ON movements(platform);
+        CREATE INDEX IF NOT EXISTS idx_movements_score ON movements(final_score);
+        CREATE INDEX IF NOT EXISTS idx_movements_growth ON movements(growth_6h);
+        CREATE INDEX IF NOT EXISTS idx_movements_age ON movements(age_hours);
+    """
+    
+    # Full-text index over title + transcript, kept in sync by triggers
+    _FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS movements_fts USING fts5(text, tokenize = 'trigram');
+        CREATE TRIGGER IF NOT EXISTS movements_fts_insert AFTER INSERT ON movements BEGIN
+            INSERT INTO movements_fts(rowid, text) VALUES (new.rowid, new.title || ' ' || new.transcript);
+        END;
+        CREATE TRIGGER IF NOT EXISTS movements_fts_delete AFTER DELETE ON movements BEGIN
+            DELETE FROM movements_fts WHERE rowid = old.rowid;
+        END;
+        CREATE TRIGGER IF NOT EXISTS movements_fts_update AFTER UPDATE ON movements BEGIN
+            UPDATE movements_fts SET text = new.title || ' ' || new.transcript WHERE rowid = old.rowid;
+        END;
+    """
+    
+    # Trigram tokens need at least three characters to be matched by FTS5
+    _FTS_MIN_KEYWORD_LENGTH = 3
+    
+    # filter key -> SQL predicate
+    _PREDICATES = {
+        "platform": "platform = ?",
+        "min_views": "views >= ?",
+        "max_views": "views <= ?",
+        "min_score": "final_score >= ?",
+        "max_score": "final_score <= ?",
+        "min_growth": "growth_6h >= ?",
+        "max_age_hours": "age_hours <= ?",
+    }
+    
+    def __init__(self, db_file: str = "viral_movements.db"):
+        self.db_file = db_file
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.executescript(self._SCHEMA)
+        self._init_fts()
+        super().__init__(db_file)
+    
+    def _init_fts(self) -> None:
+        """Create the keyword index, backfilling it for stores created without one"""
+        has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'movements_fts'"
+        ).fetchone()
+        self._conn.executescript(self._FTS_SCHEMA)
+        if not has_fts:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO movements_fts(rowid, text) "
+                    "SELECT rowid, title || ' ' || transcript FROM movements"
+                )
+    
+    def _load_data(self) -> Dict[str, Any]:
+        """Create the in-memory summary/metadata; movements stay in SQLite"""
+        return {
             "summary": {
-                "total_movements": 0,
+                "total_movements": self._count(),
                 "filtered_movements": 0,
                 "processing_time": 0.0,
                 "timestamp": datetime.now().isoformat()
@@ -399,7 +686,201 @@ class ViralMovementsDataAccess:
                 "last_updated": datetime.now().isoformat()
             }
         }
-        self._save_data()
+    
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM movements").fetchone()[0]
+    
+    def add_movements(self, movements: List[Dict[str, Any]]) -> None:
+        """Insert or update movements in a single transaction, keeping replaced rows in place"""
+        rows = []
+        for movement in movements:
+            movement_data = self._normalize_movement(movement)
+            rows.append((
+                movement_data["id"], movement_data["platform"], movement_data["views"],
+                movement_data["scores"].get("final_score", 0), movement_data["growth_6h"],
+                movement_data["age_hours"], movement_data["title"], movement_data["transcript"],
+                _json_dumps(movement_data)
+            ))
+        
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO movements "
+                "(id, platform, views, final_score, growth_6h, age_hours, title, transcript, json) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET platform = excluded.platform, views = excluded.views, "
+                "final_score = excluded.final_score, growth_6h = excluded.growth_6h, "
+                "age_hours = excluded.age_hours, title = excluded.title, "
+                "transcript = excluded.transcript, json = excluded.json",
+                rows
+            )
+        
+        # Update summary
+        self.data["summary"]["total_movements"] = self._count()
+        self.data["summary"]["timestamp"] = datetime.now().isoformat()
+        self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+    
+    def get_all_movements(self) -> List[Dict[str, Any]]:
+        """Get all movements in insertion order"""
+        cursor = self._conn.execute("SELECT json FROM movements ORDER BY rowid")
+        return [_json_loads(row[0]) for row in cursor]
+    
+    def filter_movements(self, **filters) -> List[Dict[str, Any]]:
+        """Filter movements with the same keys as ViralMovementsDataAccess.filter_movements"""
+        query = "SELECT json FROM movements WHERE 1=1"
+        params = []
+        
+        for key, predicate in self._PREDICATES.items():
+            if key in filters:
+                query += f" AND {predicate}"
+                params.append(filters[key])
+        
+        # Keyword search
+        if "keywords" in filters:
+            clauses = []
+            terms = [k for k in filters["keywords"] if len(k) >= self._FTS_MIN_KEYWORD_LENGTH]
+            if terms:
+                clauses.append("rowid IN (SELECT rowid FROM movements_fts WHERE movements_fts MATCH ?)")
+                params.append(" OR ".join('"' + term.replace('"', '""') + '"' for term in terms))
+            # Keywords too short for the trigram index fall back to a LIKE scan
+            for keyword in filters["keywords"]:
+                if len(keyword) < self._FTS_MIN_KEYWORD_LENGTH:
+                    clauses.append("(title || ' ' || transcript) LIKE ? ESCAPE '\\'")
+                    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    params.append(f"%{escaped}%")
+            query += f" AND ({' OR '.join(clauses) or '0'})"
+        
+        # Sort by score (highest first), insertion order for equal scores
+        query += " ORDER BY final_score DESC, rowid"
+        
+        # Limit results
+        if filters.get("limit") is not None and filters["limit"] >= 0:
+            query += " LIMIT ?"
+            params.append(filters["limit"])
+        
+        cursor = self._conn.execute(query, params)
+        return [_json_loads(row[0]) for row in cursor]
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get data summary computed by SQLite aggregates"""
+        total, avg_score, max_score, min_score, avg_views, max_views, high_score, trending = self._conn.execute(
+            "SELECT COUNT(*), AVG(final_score), MAX(final_score), MIN(final_score), "
+            "AVG(views), MAX(views), SUM(final_score >= 15), SUM(growth_6h >= 3.0) FROM movements"
+        ).fetchone()
+        
+        if not total:
+            return self.data["summary"]
+        
+        platforms = dict(self._conn.execute(
+            "SELECT platform, COUNT(*) FROM movements GROUP BY platform ORDER BY MIN(rowid)"
+        ).fetchall())
+        
+        return {
+            **self.data["summary"],
+            "statistics": {
+                "total_movements": total,
+                "avg_score": avg_score,
+                "max_score": max_score,
+                "min_score": min_score,
+                "avg_views": avg_views,
+                "max_views": max_views,
+                "platforms": platforms,
+                "high_score_movements": high_score,
+                "trending_movements": trending
+            }
+        }
+    
+    def clear_data(self) -> None:
+        """Clear all movement data"""
+        with self._conn:
+            self._conn.execute("DELETE FROM movements")
+        self.data = self._load_data()
+    
+    def flush(self) -> None:
+        """Nothing to flush; every write is committed as it happens"""
+    
+    def close(self) -> None:
+        """Close the underlying SQLite connection"""
+        self._conn.close()
+
+
+# Row-level clause per filter_movements key, in evaluation order
+_PREDICATE_CLAUSES = {
+    "platform": 'm["platform"] == platform',
+    "min_views": 'm["views"] >= min_views',
+    "max_views": 'm["views"] <= max_views',
+    "min_score": 'm["scores"].get("final_score", 0) >= min_score',
+    "max_score": 'm["scores"].get("final_score", 0) <= max_score',
+    "min_growth": 'm["growth_6h"] >= min_growth',
+    "max_age_hours": 'm["age_hours"] <= max_age_hours',
+    "keywords": "_has_keyword(m, keywords)",
+}
+
+def _has_keyword(movement: Dict[str, Any], keywords: List[str]) -> bool:
+    """Whether any lowercased keyword occurs in the movement's search text"""
+    blob = _search_blob(movement)
+    return any(k in blob for k in keywords)
+
+
+# Compiled predicate factories keyed by the set of filters in use
+_predicate_factories: Dict[frozenset, Callable[..., Callable[[Dict[str, Any]], bool]]] = {}
+
+
+def _predicate_factory(keys: frozenset) -> Callable[..., Callable[[Dict[str, Any]], bool]]:
+    """Generate (once per filter combination) a factory for a single-expression predicate"""
+    factory = _predicate_factories.get(keys)
+    if factory is None:
+        names = [key for key in _PREDICATE_CLAUSES if key in keys]
+        body = " and ".join(_PREDICATE_CLAUSES[key] for key in names) or "True"
+        namespace = {"_has_keyword": _has_keyword}
+        exec(f"def factory({', '.join(names)}):\n    return lambda m: {body}\n", namespace)
+        factory = _predicate_factories[keys] = namespace["factory"]
+    return factory
+
+
+def _movement_predicate(filters: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """Build a single row predicate for the filter_movements keys"""
+    values = {key: filters[key] for key in _PREDICATE_CLAUSES if key in filters}
+    if "keywords" in values:
+        values["keywords"] = [k.lower() for k in values["keywords"]]
+    return _predicate_factory(frozenset(values))(**values)
+
+
+def iter_movements(data_file: str = "viral_movements_data.json") -> Iterator[Dict[str, Any]]:
+    """
+    Stream movements from a JSON data file one row at a time.
+    
+    With ijson installed only the current movement is held in memory;
+    otherwise the file is parsed in full and iterated.
+    """
+    if not os.path.exists(data_file):
+        return
+    
+    with open(data_file, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'movements.item', use_float=True)
+        else:
+            yield from _json_loads(f.read()).get("movements", [])
+
+
+def stream_filter_movements(data_file: str = "viral_movements_data.json", **filters) -> List[Dict[str, Any]]:
+    """
+    Filter a JSON data file without loading the whole store.
+    
+    Accepts the same keys as ViralMovementsDataAccess.filter_movements.
+    Rows are matched as they are parsed and a limit keeps only a bounded
+    top-K heap, so peak memory follows the result size, not the file size.
+    """
+    matches = filter(_movement_predicate(filters), iter_movements(data_file))
+    key = lambda m: m["scores"].get("final_score", 0)
+    
+    limit = filters.get("limit")
+    if limit is not None and limit >= 0:
+        return heapq.nlargest(limit, matches, key=key)
+    
+    movements = sorted(matches, key=key, reverse=True)
+    if limit is not None:
+        movements = movements[:limit]
+    return movements
 
 
 # Example usage and demo data
@@ -1,17 +1,43 @@
 import sqlite3
-import pandas as pd
-from sentence_transformers import SentenceTransformer, util
+import torch
+from sentence_transformers import SentenceTransformer
 import whisper
+try:
+    from faster_whisper import WhisperModel  # int8 CTranslate2 Whisper; optional
+except ImportError:
+    WhisperModel = None
+try:
+    from numba import njit  # Compiles the scoring arithmetic; optional
+except ImportError:
+    njit = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq  # Columnar selections output; optional
+except ImportError:
+    pa = pq = None
+try:
+    import faiss  # Near-duplicate search over stored embeddings; optional
+except ImportError:
+    faiss = None
 import imagehash
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
 import io
+import csv
 import yt_dlp  # For downloading movement snippets
 from sklearn.linear_model import LinearRegression
 import datetime
-import math
+import heapq
+import functools
+import hashlib
+import numpy as np
 import os
+import platform
+import psutil
 import json  # Assume API fetches return JSON
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Import monitoring system - ADD THESE LINES
 from monitoring.decorators import monitor_all, monitor_execution, track_performance
@@ -19,17 +45,94 @@ from monitoring.core import ensure_initialized
 
 # Setup
 NICHE_KEYWORDS = ["gaming", "memes"]  # Your niche
+KNOWN_SOURCES = ["youtube", "tiktok", "instagram"]
+KNOWN_TOPICS = NICHE_KEYWORDS
+# Fixed one-hot layout for weekly_feedback, so feature columns keep their order week to week
+FEATURE_INDEX = {col: i for i, col in enumerate([('source', v) for v in KNOWN_SOURCES] + [('topic', v) for v in KNOWN_TOPICS])}
 DB_FILE = "movements_history.db"
-EXCEL_FILE = "movement_selections.xlsx"
-MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-WHISPER_MODEL = whisper.load_model("tiny")
+SELECTIONS_FILE = "movement_selections.csv"
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+def onnx_model_file():
+    # The model ships int8 dynamic-quantized exports tuned per instruction set;
+    # pick the one built for this CPU's vector instructions
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        return 'onnx/model_qint8_arm64.onnx'
+    try:
+        with open('/proc/cpuinfo') as f:
+            if 'avx512_vnni' in f.read():
+                return 'onnx/model_qint8_avx512_vnni.onnx'
+    except OSError:
+        pass
+    return 'onnx/model_quint8_avx2.onnx'
+
+MODEL_ONNX_FILE = onnx_model_file()
+INFERENCE_THREADS = psutil.cpu_count(logical=False) or os.cpu_count() or 1  # Physical cores
+
+def configure_inference_threads(n=INFERENCE_THREADS):
+    # Pin PyTorch intra-op threads to the physical cores instead of the platform
+    # default. The thumbnail and audio download pools are I/O-bound and barely
+    # compete for CPU; halve n if CPU-heavy work is ever run alongside inference
+    torch.set_num_threads(n)
+    try:
+        torch.set_num_interop_threads(2)
+    except RuntimeError:  # Fixed once inter-op work has started
+        pass
+
+DEVICE = 'cuda' if torch.cuda.is_available() else 'cpu'
+# Encoder behind get_model(); part of the embedding cache key so int8 ONNX, FP32 and CUDA vectors never mix
+EMB_BACKEND = 'cuda' if DEVICE == 'cuda' else MODEL_ONNX_FILE
+
+def load_sentence_model():
+    # Prefer the int8 ONNX Runtime backend on CPU; fall back to FP32 PyTorch when
+    # sentence-transformers < 3.2 or optimum/onnxruntime are not installed
+    global EMB_BACKEND
+    if DEVICE == 'cuda':
+        return SentenceTransformer(MODEL_NAME, device=DEVICE)  # The int8 exports are CPU kernels
+    try:
+        return SentenceTransformer(MODEL_NAME, backend='onnx', model_kwargs={'file_name': MODEL_ONNX_FILE})
+    except Exception:
+        EMB_BACKEND = 'cpu-fp32'
+        return SentenceTransformer(MODEL_NAME)
+
+@functools.lru_cache(maxsize=1)
+def get_model():
+    # Models load on first use, so importing the module or running only the
+    # non-ML paths (weekly feedback, id/thumbnail dedup) skips the load entirely
+    return load_sentence_model()
+
+@functools.lru_cache(maxsize=1)
+def get_whisper():
+    if WhisperModel is not None:
+        return WhisperModel("tiny", device="cpu", compute_type="int8", cpu_threads=INFERENCE_THREADS)
+    return whisper.load_model("tiny")
+
+configure_inference_threads()
 WEIGHTS = {'views': 0.4, 'velocity': 0.3, 'engagement': 0.2, 'relevance': 0.1}  # Initial; updated weekly
+SCORE_THRESHOLD = 15  # Threshold example
+_NICHE_EMB_CACHE = {}  # tuple(niche_keywords) -> niche embedding
+EMB_CACHE_DTYPE = np.float16  # Storage precision of the on-disk embedding cache
+DUP_SIMILARITY = 0.95  # Cosine similarity above which two texts count as the same movement
+_HISTORY_KEYS = {}  # history column -> set of stored values, loaded on first lookup
+_DEDUP_INDEX = None  # Embeddings of accepted movements, loaded on first use
 
-# Init DB
-conn = sqlite3.connect(DB_FILE)
-conn.execute('''CREATE TABLE IF NOT EXISTS history (video_id TEXT PRIMARY KEY, hash TEXT)''')
-conn.execute('''CREATE TABLE IF NOT EXISTS performance (video_id TEXT, source TEXT, length FLOAT, topic TEXT, rpm FLOAT)''')
-conn.close()
+# Shared HTTP session so thumbnail fetches reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+SESSION.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Init DB; one long-lived WAL connection shared by the dedup lookups
+DB_CONN = sqlite3.connect(DB_FILE, check_same_thread=False)
+DB_CONN.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA mmap_size=268435456; PRAGMA cache_size=-65536;")
+DB_CONN.execute('''CREATE TABLE IF NOT EXISTS history (video_id TEXT PRIMARY KEY, hash TEXT, thumbnail_url TEXT)''')
+if 'thumbnail_url' not in [col[1] for col in DB_CONN.execute("PRAGMA table_info(history)")]:
+    DB_CONN.execute("ALTER TABLE history ADD COLUMN thumbnail_url TEXT")  # Databases created before the column existed
+DB_CONN.execute("CREATE INDEX IF NOT EXISTS idx_history_thumbnail_url ON history(thumbnail_url)")
+DB_CONN.execute("CREATE INDEX IF NOT EXISTS idx_history_hash ON history(hash)")
+DB_CONN.execute('''CREATE TABLE IF NOT EXISTS performance (video_id TEXT, source TEXT, length FLOAT, topic TEXT, rpm FLOAT)''')
+DB_CONN.execute('''CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB)''')  # Normalized text embeddings by content hash
+DB_CONN.execute('''CREATE TABLE IF NOT EXISTS dedup_vectors (video_id TEXT PRIMARY KEY, vec BLOB)''')  # Embeddings of accepted movements
+DB_CONN.commit()
 
 @monitor_all(weight=3.0)  # ADD THIS DECORATOR - High weight as this is a major step
 def fetch_trending_movements(platform='youtube', limit=100):
@@ -38,72 +141,238 @@ def fetch_trending_movements(platform='youtube', limit=100):
     # 'age_hours': float, 'growth_6h': float, 'transcript': str (fetch via API), 'thumbnail_url': str, 'url': str}
     return []  # Implement real fetch
 
+def maybe_njit(**options):
+    # Numba-compile when available; otherwise the function runs as plain Python/NumPy
+    return njit(cache=True, fastmath=True, **options) if njit else (lambda fn: fn)
+
 @track_performance  # ADD THIS DECORATOR
 def calculate_virality(views_last_24h, likes, comments, shares, views):
-    if views == 0: return 0
-    return math.log10(views_last_24h + 1) * ((likes + comments + shares) / views)
+    # Single-clip entry point; the arithmetic lives in calculate_virality_batch
+    columns = (np.array([value], dtype=np.float64) for value in (views_last_24h, likes, comments, shares, views))
+    return float(calculate_virality_batch(*columns)[0])
+
+@maybe_njit()
+def calculate_virality_batch(views_last_24h, likes, comments, shares, views):
+    # Elementwise over the clip columns; 0 where a clip has no views
+    return np.where(views > 0, np.log10(views_last_24h + 1) * (likes + comments + shares) / np.maximum(views, 1), 0.0)
+
+def niche_embedding(niche_keywords):
+    key = tuple(niche_keywords)
+    if key not in _NICHE_EMB_CACHE:  # Niche is constant across a run; encode it once
+        _NICHE_EMB_CACHE[key] = get_model().encode(' '.join(niche_keywords), normalize_embeddings=True)
+    return _NICHE_EMB_CACHE[key]
+
+@functools.lru_cache(maxsize=4096)
+def text_embedding(text):
+    return get_model().encode(text, normalize_embeddings=True, show_progress_bar=False)  # Trending feeds repeat titles; encode each distinct text once
 
 @track_performance  # ADD THIS DECORATOR
 def calculate_relevance(title_transcript, niche_keywords):
-    niche_emb = MODEL.encode(' '.join(niche_keywords))
-    clip_emb = MODEL.encode(title_transcript)
-    return util.cos_sim(niche_emb, clip_emb)[0][0].item()
+    niche_emb = niche_embedding(niche_keywords)
+    clip_emb = text_embedding(title_transcript)
+    return float(niche_emb @ clip_emb)  # Both unit-length, so the dot product is the cosine
+
+@track_performance
+def cached_embeddings(texts):
+    # Feeds recycle titles across runs, so look embeddings up on disk by content
+    # hash and only encode the misses, in one batch. Vectors are stored as FP16,
+    # half the bytes of FP32 with negligible cosine drift on unit-length vectors
+    backend = EMB_BACKEND
+    keys = [hashlib.sha1(f'{MODEL_NAME}\0{backend}\0{EMB_CACHE_DTYPE.__name__}\0{text}'.encode()).hexdigest() for text in texts]
+    rows = DB_CONN.execute("SELECT key, vec FROM embeddings WHERE key IN (SELECT value FROM json_each(?))", (json.dumps(keys),))
+    embs = {key: np.frombuffer(vec, dtype=EMB_CACHE_DTYPE) for key, vec in rows}
+    misses = [(key, text) for key, text in zip(keys, texts) if key not in embs]
+    if misses:
+        model = get_model()
+        if EMB_BACKEND != backend:  # Loading fell back to another encoder; look up under its keys
+            return cached_embeddings(texts)
+        encoded = model.encode([text for _, text in misses], batch_size=64, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+        with DB_CONN:
+            DB_CONN.executemany("INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                                [(key, emb.astype(EMB_CACHE_DTYPE).tobytes()) for (key, _), emb in zip(misses, encoded)])
+        embs.update((key, emb.astype(EMB_CACHE_DTYPE)) for (key, _), emb in zip(misses, encoded))
+    return np.stack([embs[key] for key in keys]).astype(np.float32)  # NumPy has no FP16 BLAS; upcast for the matmul
+
+@track_performance
+def calculate_relevance_batch(title_transcripts, niche_keywords):
+    # One batched forward pass for all texts; with unit-length embeddings the
+    # cosine similarities are a single matrix-vector product
+    if not title_transcripts: return []
+    unique = list(dict.fromkeys(title_transcripts))  # Repeated texts share one encoding
+    relevance = dict(zip(unique, (cached_embeddings(unique) @ niche_embedding(niche_keywords)).tolist()))
+    return [relevance[text] for text in title_transcripts]
 
 @monitor_execution  # ADD THIS DECORATOR
 def velocity_filter(growth_6h):
     return growth_6h >= 3.0  # 300%
 
-@monitor_all(weight=2.0)  # ADD THIS DECORATOR - Medium-high weight for deduplication
-def deduplicate(video_id, thumbnail_url):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT * FROM history WHERE video_id=?", (video_id,))
-    if c.fetchone(): return True
+def _history_keys(column):
+    # Each history column is read once per process into a set; later lookups are
+    # in-memory and _remember_history keeps the sets in step with inserts
+    if column not in _HISTORY_KEYS:
+        _HISTORY_KEYS[column] = {row[0] for row in DB_CONN.execute(f"SELECT {column} FROM history WHERE {column} IS NOT NULL")}
+    return _HISTORY_KEYS[column]
+
+def _history_matches(column, values):
+    known = _history_keys(column)
+    return {value for value in values if value in known}
+
+def _remember_history(rows):
+    for column, values in zip(('video_id', 'hash', 'thumbnail_url'), zip(*rows)):
+        if column in _HISTORY_KEYS:
+            _HISTORY_KEYS[column].update(values)
+
+def thumbnail_hash(thumbnail_url):
     try:
-        img = Image.open(io.BytesIO(requests.get(thumbnail_url).content))
-        phash = str(imagehash.phash(img))
-        c.execute("SELECT * FROM history WHERE hash=?", (phash,))
-        if c.fetchone(): return True
-        c.execute("INSERT INTO history VALUES (?, ?)", (video_id, phash))
-        conn.commit()
-    except: pass
-    conn.close()
-    return False
+        img = Image.open(io.BytesIO(SESSION.get(thumbnail_url, timeout=5).content))
+        img.draft('L', (64, 64))  # phash only needs 32x32 grayscale; let libjpeg downscale while decoding
+        return str(imagehash.phash(img))
+    except Exception: return None
 
-@monitor_execution  # ADD THIS DECORATOR
-def reactability_check(movement_url):
+@monitor_all(weight=2.0)  # ADD THIS DECORATOR - Medium-high weight for deduplication
+def deduplicate_batch(movements, max_workers=16):
+    # Known ids, thumbnails and hashes are checked against in-memory sets of the
+    # history table, and new rows are written in a single transaction.
+    # Movements repeating an id, thumbnail or hash earlier in the batch are dropped as well.
+    seen_ids = _history_matches('video_id', [m['id'] for m in movements])
+    seen_urls = _history_matches('thumbnail_url', [m['thumbnail_url'] for m in movements])
+    candidates = []
+    for movement in movements:
+        if movement['id'] in seen_ids or movement['thumbnail_url'] in seen_urls: continue  # Known thumbnails skip the download
+        seen_ids.add(movement['id'])
+        seen_urls.add(movement['thumbnail_url'])
+        candidates.append(movement)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:  # Network-bound; stays within the session pool size
+        hashes = list(executor.map(thumbnail_hash, [m['thumbnail_url'] for m in candidates]))
+    seen_hashes = _history_matches('hash', [phash for phash in hashes if phash])
+    survivors, rows = [], []
+    for movement, phash in zip(candidates, hashes):
+        if phash:
+            if phash in seen_hashes: continue
+            seen_hashes.add(phash)
+            rows.append((movement['id'], phash, movement['thumbnail_url']))
+        survivors.append(movement)  # Unhashable thumbnails are kept, as before
+    with DB_CONN:
+        DB_CONN.executemany("INSERT OR IGNORE INTO history (video_id, hash, thumbnail_url) VALUES (?, ?, ?)", rows)
+    _remember_history(rows)
+    return survivors
+
+def dedup_index(dim):
+    # Loaded from SQLite once per process: a FAISS inner-product index when faiss
+    # is installed, else a NumPy matrix searched with one matmul
+    global _DEDUP_INDEX
+    if _DEDUP_INDEX is None:
+        stored = np.array([np.frombuffer(vec, dtype=EMB_CACHE_DTYPE) for (vec,) in DB_CONN.execute("SELECT vec FROM dedup_vectors")],
+                          dtype=np.float32).reshape(-1, dim)
+        if faiss is not None:
+            _DEDUP_INDEX = faiss.IndexFlatIP(dim)
+            _DEDUP_INDEX.add(stored)
+        else:
+            _DEDUP_INDEX = stored
+    return _DEDUP_INDEX
+
+@track_performance
+def semantic_deduplicate(movements, texts, threshold=DUP_SIMILARITY):
+    # Catches re-uploads phash misses: a movement whose text embedding is within the cosine
+    # threshold of a stored movement, or of an earlier one in this batch, is dropped. The
+    # embeddings come from the same cache calculate_relevance_batch reads
+    global _DEDUP_INDEX
+    if not movements: return []
+    embs = cached_embeddings(texts)
+    index = dedup_index(embs.shape[1])
+    if faiss is not None:
+        best = index.search(embs, 1)[0][:, 0] if index.ntotal else np.full(len(embs), -1.0)
+    else:
+        best = (embs @ index.T).max(axis=1) if len(index) else np.full(len(embs), -1.0)
+    keep = []
+    for i in range(len(movements)):
+        if best[i] > threshold or (keep and (embs[keep] @ embs[i]).max() > threshold): continue
+        keep.append(i)
+    accepted = embs[keep]
+    with DB_CONN:
+        DB_CONN.executemany("INSERT OR REPLACE INTO dedup_vectors (video_id, vec) VALUES (?, ?)",
+                            [(movements[i]['id'], emb.astype(EMB_CACHE_DTYPE).tobytes()) for i, emb in zip(keep, accepted)])
+    if faiss is not None:
+        index.add(accepted)
+    else:
+        _DEDUP_INDEX = np.vstack([index, accepted])
+    return [movements[i] for i in keep]
+
+def download_audio(movement_url, path):
     try:
-        with yt_dlp.YoutubeDL({'quiet': True, 'format': 'bestaudio', 'outtmpl': 'temp.mp3'}) as ydl:
+        with yt_dlp.YoutubeDL({'quiet': True, 'format': 'bestaudio', 'outtmpl': path}) as ydl:
             ydl.download([movement_url])
-        audio = whisper.load_audio("temp.mp3")[:5 * 16000]  # First 5s
-        result = WHISPER_MODEL.transcribe(audio)
-        text = result['text']
-        os.remove("temp.mp3")
+    except Exception: return None
+    return path
+
+def transcribe(audio):
+    if WhisperModel is None:
+        return get_whisper().transcribe(audio)['text']
+    segments, _ = get_whisper().transcribe(audio, language='en', beam_size=1)
+    return ''.join(segment.text for segment in segments)
+
+def audio_reactability(path):
+    try:
+        audio = whisper.load_audio(path)[:5 * 16000]  # First 5s
+        text = transcribe(audio)
         if not text.strip() or "music" in text.lower():  # Rough check
             return -0.8
-    except: return 0
+    except Exception: return 0
     return 0
 
+@monitor_execution  # ADD THIS DECORATOR
+def reactability_check(movement_url):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = download_audio(movement_url, os.path.join(tmp_dir, 'temp.mp3'))
+        if not path: return 0
+        return audio_reactability(path)
+
+@monitor_execution
+def reactability_batch(movements, max_workers=8):
+    # Downloads are network-bound, so fetch them concurrently to unique paths
+    # and run Whisper on this thread
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f'{i}.mp3') for i in range(len(movements))]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            downloaded = list(executor.map(download_audio, [m['url'] for m in movements], paths))
+        return [audio_reactability(path) if path else 0 for path in downloaded]
+
 @monitor_all(weight=4.0)  # ADD THIS DECORATOR - Highest weight as this is the core scoring function
-def final_score(movement, weights):
-    virality = calculate_virality(movement['views_last_24h'], movement['likes'], movement['comments'], movement['shares'], movement['views'])
-    relevance = calculate_relevance(movement['title'] + ' ' + movement['transcript'], NICHE_KEYWORDS)
-    engagement = 0.5 * (movement['likes'] + movement['comments']) + 0.3 * movement['shares'] + 0.2 * movement.get('saves', 0) / movement['views'] * 1000
-    penalty = movement['age_hours'] * 0.5 if movement['age_hours'] > 12 else 0
-    react_penalty = reactability_check(movement['url'])
-    return (virality + relevance) * (weights['views'] * movement['views'] + weights['velocity'] * movement['views_last_24h'] + weights['engagement'] * engagement + weights['relevance'] * relevance) - penalty + react_penalty
+def final_score(movement, weights, relevance=None, react_penalty=None):
+    # Single-movement entry point; the arithmetic lives in final_score_batch
+    if relevance is None:
+        relevance = calculate_relevance(movement['title'] + ' ' + movement['transcript'], NICHE_KEYWORDS)
+    if react_penalty is None:
+        react_penalty = reactability_check(movement['url'])
+    return float(final_score_batch([movement], weights, [relevance], [react_penalty])[0])
+
+@track_performance
+def final_score_batch(movements, weights, relevances, react_penalties):
+    # Score every movement in one pass; only reactability is computed per movement upstream
+    cols = [np.array([m.get(key, 0) for m in movements], np.float64)
+            for key in ('views', 'views_last_24h', 'likes', 'comments', 'shares', 'saves', 'age_hours')]
+    return compute_scores(*cols, np.asarray(relevances, np.float64), np.asarray(react_penalties, np.float64),
+                          weights['views'], weights['velocity'], weights['engagement'], weights['relevance'])
+
+@maybe_njit(parallel=True)
+def compute_scores(views, views_24h, likes, comments, shares, saves, age, relevance, react_penalty, wv, wvel, we, wr):
+    virality = calculate_virality_batch(views_24h, likes, comments, shares, views)
+    engagement = 0.5 * (likes + comments) + 0.3 * shares + 0.2 * saves / np.maximum(views, 1) * 1000
+    penalty = np.where(age > 12, age * 0.5, 0.0)
+    return (virality + relevance) * (wv * views + wvel * views_24h + we * engagement + wr * relevance) - penalty + react_penalty
 
 @monitor_execution  # ADD THIS DECORATOR
 def weekly_feedback():
     if datetime.datetime.now().weekday() != 6: return  # Sunday
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT * FROM performance ORDER BY video_id DESC LIMIT 20", conn)
-    conn.close()
-    if len(df) < 20: return
-    # Features: source (one-hot), length, topic (one-hot)
-    X = pd.get_dummies(df[['source', 'topic']])
-    X['length'] = df['length']
-    y = df['rpm']
+    rows = DB_CONN.execute("SELECT source, topic, length, rpm FROM performance ORDER BY video_id DESC LIMIT 20").fetchall()
+    if len(rows) < 20: return
+    # Features: source (one-hot), topic (one-hot), length
+    X = np.zeros((len(rows), len(FEATURE_INDEX) + 1))
+    for i, (source, topic, length, _) in enumerate(rows):
+        for col in (('source', source), ('topic', topic)):
+            if col in FEATURE_INDEX: X[i, FEATURE_INDEX[col]] = 1.0  # Unknown categories stay all-zero
+        X[i, -1] = length
+    y = np.fromiter((r[3] for r in rows), dtype=np.float64, count=len(rows))
     reg = LinearRegression().fit(X, y)
     # Rough re-weight: normalize coefs to sum=1
     coefs = reg.coef_
@@ -111,6 +380,21 @@ def weekly_feedback():
     total = sum(new_weights.values())
     WEIGHTS.update({k: v/total for k,v in new_weights.items()})
 
+@monitor_execution  # ADD THIS DECORATOR
+def write_selections(rows, path):
+    # Stream rows straight to CSV (or snappy Parquet for a .parquet path when pyarrow is
+    # installed); the union of keys keeps optional fields like 'saves'
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    if path.endswith('.parquet'):
+        if pq is not None:
+            pq.write_table(pa.table({key: [row.get(key) for row in rows] for key in fieldnames}), path, compression='snappy')
+            return
+        path = os.path.splitext(path)[0] + '.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
 @monitor_all(weight=5.0)  # ADD THIS DECORATOR - Highest weight as this is the main workflow
 def main():
     # Initialize monitoring system - ADD THIS LINE
@@ -119,18 +403,20 @@ def main():
     
     weekly_feedback()
     movements = fetch_trending_movements()
-    filtered = []
-    for movement in movements:
-        if not velocity_filter(movement['growth_6h']): continue
-        if deduplicate(movement['id'], movement['thumbnail_url']): continue
-        score = final_score(movement, WEIGHTS)
-        if score > 15:  # Threshold example
-            filtered.append({**movement, 'score': score})
-    df = pd.DataFrame(filtered)
-    df.to_excel(EXCEL_FILE, index=False)
+    survivors = deduplicate_batch([movement for movement in movements if velocity_filter(movement['growth_6h'])])
+    survivors = semantic_deduplicate(survivors, [m['title'] + ' ' + m['transcript'] for m in survivors])
+    relevances = calculate_relevance_batch([m['title'] + ' ' + m['transcript'] for m in survivors], NICHE_KEYWORDS)
+    # Reactability only ever lowers a score, so audio is checked just for movements that
+    # already clear the threshold without it
+    base_scores = final_score_batch(survivors, WEIGHTS, relevances, np.zeros(len(survivors)))
+    contenders = np.flatnonzero(base_scores > SCORE_THRESHOLD)
+    react_penalties = reactability_batch([survivors[i] for i in contenders])
+    scores = base_scores[contenders] + np.asarray(react_penalties, np.float64)
+    filtered = [{**survivors[i], 'score': float(score)} for i, score in zip(contenders, scores) if score > SCORE_THRESHOLD]
+    write_selections(filtered, SELECTIONS_FILE)
     
     print(f"✅ Analysis complete! Selected {len(filtered)} movements")
-    return filtered[:5]  # Top 5
+    return heapq.nlargest(5, filtered, key=lambda c: c['score'])  # Top 5 by score
 
 if __name__ == "__main__":
     result = main()
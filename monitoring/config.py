@@ -19,6 +19,7 @@ class AlertConfiguration:
 
 @dataclass
 class MonitoringConfig:
+    enabled: bool = True  # read when functions are decorated; False leaves them unwrapped
     log_level: str = "INFO"
     database_path: str = "monitoring.db"
     log_file_path: str = "monitoring.log"
@@ -31,6 +32,12 @@ class MonitoringConfig:
     performance_threshold_multiplier: float = 1.5
     error_rate_threshold: float = 0.1  # 10%
     error_rate_window: int = 10  # minutes
+    write_batch_size: int = 100  # buffered monitoring rows per database transaction
+    write_flush_interval: float = 1.0  # seconds before a partial batch is written
+    log_queue_max: int = 10000  # buffered rows per table before logs are dropped and metrics aggregated
+    capture_traceback: bool = True  # store formatted tracebacks with error log entries
+    traceback_max_frames: int = 20  # innermost frames kept per stored traceback
+    min_sample_duration: float = 0.001  # seconds; shorter calls skip the memory sample
     alerts: List[AlertConfiguration] = None
     
     def __post_init__(self):
@@ -81,6 +88,7 @@ class ConfigManager:
             
             # Validate and create config object
             self.config = self._validate_config(config_data)
+            self._notify_callbacks()
             return self.config
             
         except (json.JSONDecodeError, FileNotFoundError, KeyError) as e:
@@ -107,6 +115,7 @@ class ConfigManager:
         
         # Validate required fields and types
         valid_fields = {
+            'enabled': bool,
             'log_level': str,
             'database_path': str,
             'log_file_path': str,
@@ -118,7 +127,13 @@ class ConfigManager:
             'update_interval': int,
             'performance_threshold_multiplier': float,
             'error_rate_threshold': float,
-            'error_rate_window': int
+            'error_rate_window': int,
+            'write_batch_size': int,
+            'write_flush_interval': float,
+            'log_queue_max': int,
+            'capture_traceback': bool,
+            'traceback_max_frames': int,
+            'min_sample_duration': float
         }
         
         for field, expected_type in valid_fields.items():
@@ -144,6 +159,10 @@ class ConfigManager:
         self.save_config()
         
         # Notify callbacks
+        self._notify_callbacks()
+    
+    def _notify_callbacks(self) -> None:
+        """Pass the current configuration to every registered callback."""
         for callback in self.callbacks:
             callback(self.config)
     
@@ -4,7 +4,7 @@ import atexit
 from .config import config_manager
 from .database import db_manager
 from .event_bus import event_bus
-from .logging_setup import setup_logging
+from .logging_setup import setup_logging, stop_logging
 
 
 class MonitoringSystem:
@@ -63,7 +63,9 @@ class MonitoringSystem:
                 'timestamp': str(db_manager._get_current_timestamp())
             })
             
-            # Cleanup old data
+            # Let queued handlers finish, write buffered rows, then cleanup old data
+            event_bus.drain()
+            db_manager.flush()
             db_manager.cleanup_old_data()
             
             # Clear event bus subscribers
@@ -73,6 +75,9 @@ class MonitoringSystem:
             
             if self.logger:
                 self.logger.info("Monitoring system shutdown complete")
+            
+            # Drain queued log records and stop the listener thread
+            stop_logging()
                 
         except Exception as e:
             if self.logger:
@@ -119,7 +124,8 @@ monitoring_system = MonitoringSystem()
 
 def ensure_initialized():
     """Ensure monitoring system is initialized."""
-    if not monitoring_system.is_initialized():
+    # Runs on every decorated call: read the flag directly rather than via is_initialized()
+    if not monitoring_system.initialized:
         monitoring_system.initialize()
 
 
@@ -1,29 +1,86 @@
 """Database operations for the monitoring system."""
+import atexit
 import sqlite3
 import threading
+from array import array
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import logging
 
-from .models import LogEntry, PerformanceMetrics, LogFilters, TimeRange
+from .models import LogEntry, PerformanceMetrics, LogFilters, TimeRange, DashboardSnapshot, log_row
 from .config import config_manager
 
 
 class DatabaseManager:
     """Manages SQLite database operations for monitoring data."""
     
+    # Per-connection tuning; journal_mode=WAL is set once and persists in the file
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+    
+    _LOG_INSERT = '''
+        INSERT INTO log_entries 
+        (timestamp, session_id, function_name, event_type, duration, 
+         parameters, result_summary, error_details, memory_usage, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    _METRICS_INSERT = '''
+        INSERT INTO performance_metrics 
+        (timestamp, function_name, execution_time, memory_peak, 
+         cpu_usage, api_calls_count, db_queries_count, success_rate, session_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    _COUNT_UPDATE = "UPDATE meta SET value = value + ? WHERE key = ?"
+    
+    # Tables whose row counts are kept in meta, with their counter keys
+    _COUNTED_TABLES = (
+        ("log_entries", "log_entries_count"),
+        ("performance_metrics", "performance_metrics_count"),
+    )
+    
     def __init__(self, db_path: str = None):
-        self.db_path = db_path or config_manager.get_config().database_path
+        config = config_manager.get_config()
+        self.db_path = db_path or config.database_path
+        self.write_batch_size = config.write_batch_size
+        self.write_flush_interval = config.write_flush_interval
+        self.buffer_max_rows = config.log_queue_max
         self._lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
+        self._conn = self._connect()
+        self._log_buffer: List[tuple] = []
+        self._metrics_columns = self._new_metrics_columns()
+        self._dropped_logs = 0
+        # function_name -> [count, total time, max memory, total cpu, total success rate, last timestamp]
+        self._metrics_overflow: Dict[str, list] = {}
+        self._buffer_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the monitoring pragmas applied."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self._CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     def _init_database(self) -> None:
         """Initialize database tables."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._conn
             try:
+                # WAL lets readers proceed during writes and avoids an fsync per commit
+                conn.execute("PRAGMA journal_mode=WAL")
+                
                 # Create log entries table
                 conn.execute('''
                     CREATE TABLE IF NOT EXISTS log_entries (
@@ -62,9 +119,29 @@ class DatabaseManager:
                 # Create indexes for better query performance
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_log_timestamp ON log_entries(timestamp)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_log_session ON log_entries(session_id)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_log_function ON log_entries(function_name)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_perf_timestamp ON performance_metrics(timestamp)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_perf_function ON performance_metrics(function_name)')
+                # Per-function queries filter on function_name and sort by timestamp; one
+                # composite index serves both, replacing the single-column function indexes
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_log_fn_ts ON log_entries(function_name, timestamp DESC)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_perf_fn_ts ON performance_metrics(function_name, timestamp DESC)')
+                conn.execute('DROP INDEX IF EXISTS idx_log_function')
+                conn.execute('DROP INDEX IF EXISTS idx_perf_function')
+                
+                # Row counts kept up to date by flush and cleanup, so stats read two
+                # rows instead of scanning both tables
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS meta (
+                        key TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL
+                    )
+                ''')
+                for table, key in self._COUNTED_TABLES:
+                    # Per-row counter triggers from earlier versions doubled the write work
+                    conn.execute(f"DROP TRIGGER IF EXISTS {table}_count_insert")
+                    conn.execute(f"DROP TRIGGER IF EXISTS {table}_count_delete")
+                    # Counted once for databases created before the counters existed
+                    if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is None:
+                        conn.execute(f"INSERT INTO meta (key, value) SELECT ?, COUNT(*) FROM {table}", (key,))
                 
                 conn.commit()
                 self.logger.info("Database initialized successfully")
@@ -73,163 +150,358 @@ class DatabaseManager:
                 self.logger.error(f"Error initializing database: {e}")
                 conn.rollback()
                 raise
-            finally:
-                conn.close()
     
     def insert_log_entry(self, entry: LogEntry) -> None:
-        """Insert a log entry into the database."""
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                data = entry.to_dict()
-                conn.execute('''
-                    INSERT INTO log_entries 
-                    (timestamp, session_id, function_name, event_type, duration, 
-                     parameters, result_summary, error_details, memory_usage, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['timestamp'], data['session_id'], data['function_name'],
-                    data['event_type'], data['duration'], data['parameters'],
-                    data['result_summary'], data['error_details'], 
-                    data['memory_usage'], data['metadata']
-                ))
-                conn.commit()
-                
-            except Exception as e:
-                self.logger.error(f"Error inserting log entry: {e}")
-                conn.rollback()
-                raise
-            finally:
-                conn.close()
+        """Queue a log entry; it is serialized and written with the next batch."""
+        self._buffer(self._log_buffer, (
+            entry.timestamp, entry.session_id, entry.function_name, entry.event_type,
+            entry.duration, entry.parameters, entry.result_summary, entry.error_details,
+            entry.memory_usage, entry.metadata
+        ))
+    
+    def record_log(self, timestamp: datetime, session_id: str, function_name: str, event_type: str,
+                   duration: Optional[float] = None, parameters: Optional[Dict[str, Any]] = None,
+                   result_summary: Optional[str] = None, error_details: Optional[str] = None) -> None:
+        """Queue one log_entries row as raw values, without a LogEntry; encoded by the writer."""
+        self._buffer(self._log_buffer, (
+            timestamp, session_id, function_name, event_type, duration,
+            parameters, result_summary, error_details, None, None
+        ))
     
     def insert_performance_metrics(self, metrics: PerformanceMetrics) -> None:
-        """Insert performance metrics into the database."""
+        """Queue performance metrics; they are serialized and written with the next batch."""
+        self.record_performance(
+            metrics.timestamp, metrics.function_name, metrics.execution_time,
+            metrics.memory_peak, metrics.cpu_usage, metrics.success_rate,
+            metrics.session_id, metrics.api_calls_count, metrics.db_queries_count
+        )
+    
+    def record_performance(self, timestamp: datetime, function_name: str, execution_time: float,
+                           memory_peak: int, cpu_usage: float = 0.0, success_rate: float = 1.0,
+                           session_id: str = "", api_calls_count: int = 0,
+                           db_queries_count: int = 0) -> None:
+        """Queue one performance_metrics row as raw column values, without a PerformanceMetrics.
+        
+        When the buffer is full the row is folded into a per-function aggregate
+        that is written as a single row with the next batch.
+        """
+        with self._buffer_lock:
+            if len(self._metrics_columns[1]) >= self.buffer_max_rows:
+                self._aggregate_metrics(timestamp, function_name, execution_time,
+                                        memory_peak, cpu_usage, success_rate)
+                self._wake.set()
+                return
+            (timestamps, function_names, execution_times, memory_peaks, cpu_usages,
+             api_calls, db_queries, success_rates, session_ids) = self._metrics_columns
+            timestamps.append(timestamp)
+            function_names.append(function_name)
+            execution_times.append(execution_time)
+            memory_peaks.append(memory_peak)
+            cpu_usages.append(cpu_usage)
+            api_calls.append(api_calls_count)
+            db_queries.append(db_queries_count)
+            success_rates.append(success_rate)
+            session_ids.append(session_id)
+            pending = self._pending()
+        self._schedule_write(pending)
+    
+    def _aggregate_metrics(self, timestamp: datetime, function_name: str, execution_time: float,
+                           memory_peak: int, cpu_usage: float, success_rate: float) -> None:
+        """Fold an overflowing metrics row into its function's aggregate; call under the buffer lock."""
+        totals = self._metrics_overflow.get(function_name)
+        if totals is None:
+            totals = self._metrics_overflow[function_name] = [0, 0.0, 0, 0.0, 0.0, timestamp]
+        totals[0] += 1
+        totals[1] += execution_time
+        totals[2] = max(totals[2], memory_peak)
+        totals[3] += cpu_usage
+        totals[4] += success_rate
+        totals[5] = timestamp
+    
+    @staticmethod
+    def _new_metrics_columns() -> tuple:
+        """Empty per-column buffers in performance_metrics insert order."""
+        return ([], [], array('d'), array('q'), array('d'), array('q'), array('q'), array('d'), [])
+    
+    def _pending(self) -> int:
+        """Number of buffered rows, starting the writer on first use; call under the buffer lock."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="monitoring-db-writer", daemon=True)
+            self._writer.start()
+        return len(self._log_buffer) + len(self._metrics_columns[1])
+    
+    def _buffer(self, buffer: list, item: Any) -> None:
+        """Add an entry to a write buffer and wake the writer when the batch is full.
+        
+        Callers only pay for the append; the writer thread serializes the entries
+        and does the inserts. If the writer falls behind and the buffer reaches
+        buffer_max_rows, the entry is dropped and counted rather than blocking the caller.
+        """
+        with self._buffer_lock:
+            if len(buffer) >= self.buffer_max_rows:
+                self._dropped_logs += 1
+                self._wake.set()
+                return
+            buffer.append(item)
+            pending = self._pending()
+        self._schedule_write(pending)
+    
+    def _schedule_write(self, pending: int) -> None:
+        """Wake the writer once a batch is full."""
+        if pending >= self.write_batch_size:
+            self._wake.set()
+    
+    def _write_loop(self) -> None:
+        """Flush buffered rows every write_flush_interval, or sooner when woken."""
+        while not self._closed:
+            self._wake.wait(self.write_flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # Already logged by flush; keep the writer alive
+    
+    def flush(self) -> None:
+        """Write all buffered entries in a single transaction."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
+            with self._buffer_lock:
+                if not (self._log_buffer or self._metrics_columns[1] or self._dropped_logs
+                        or self._metrics_overflow):
+                    return
+                log_entries = list(self._log_buffer)
+                self._log_buffer.clear()  # In place: _buffer callers hold a reference to this list
+                metrics_columns, self._metrics_columns = self._metrics_columns, self._new_metrics_columns()
+                dropped, self._dropped_logs = self._dropped_logs, 0
+                overflow, self._metrics_overflow = self._metrics_overflow, {}
+            gap = []
+            if dropped:
+                # Record the gap so readers know log entries are missing
+                gap.append((datetime.now(), '', __name__, 'dropped', None,
+                            {'dropped_entries': dropped}, None, None, None, None))
+                self.logger.warning(f"Log buffer full; dropped {dropped} monitoring log entries")
+            log_rows = self._log_rows(log_entries + gap)
+            timestamps = [timestamp.isoformat() for timestamp in metrics_columns[0]]
+            metrics_rows = list(zip(timestamps, *metrics_columns[1:]))
+            # One averaged row per function for metrics that overflowed the buffer
+            for function_name, (count, total_time, max_memory, total_cpu,
+                                total_success, timestamp) in overflow.items():
+                metrics_rows.append((timestamp.isoformat(), function_name, total_time / count,
+                                     max_memory, total_cpu / count, 0, 0, total_success / count,
+                                     f"aggregate:{count}"))
             try:
-                data = metrics.to_dict()
-                conn.execute('''
-                    INSERT INTO performance_metrics 
-                    (timestamp, function_name, execution_time, memory_peak, 
-                     cpu_usage, api_calls_count, db_queries_count, success_rate, session_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    data['timestamp'], data['function_name'], data['execution_time'],
-                    data['memory_peak'], data['cpu_usage'], data['api_calls_count'],
-                    data['db_queries_count'], data['success_rate'], data['session_id']
-                ))
-                conn.commit()
-                
+                with self._conn:
+                    self._conn.executemany(self._LOG_INSERT, log_rows)
+                    self._conn.executemany(self._METRICS_INSERT, metrics_rows)
+                    self._conn.executemany(self._COUNT_UPDATE, (
+                        (len(log_rows), "log_entries_count"),
+                        (len(metrics_rows), "performance_metrics_count"),
+                    ))
             except Exception as e:
-                self.logger.error(f"Error inserting performance metrics: {e}")
-                conn.rollback()
+                self.logger.error(f"Error writing {len(log_rows)} log entries and "
+                                  f"{len(metrics_rows)} performance metrics: {e}")
+                self._requeue(log_entries, metrics_columns, dropped, overflow)
                 raise
-            finally:
-                conn.close()
+    
+    def _requeue(self, log_entries: List[tuple], metrics_columns: tuple, dropped: int,
+                 overflow: Dict[str, list]) -> None:
+        """Put rows from a failed write back in front of the buffers so the next flush retries them.
+        
+        Rows buffered during the failed write stay behind the requeued ones; anything
+        past buffer_max_rows is dropped or aggregated as if the buffer had filled.
+        """
+        with self._buffer_lock:
+            self._log_buffer[:0] = log_entries  # In place, as in flush
+            excess = len(self._log_buffer) - self.buffer_max_rows
+            if excess > 0:
+                del self._log_buffer[-excess:]
+                dropped += excess
+            self._dropped_logs += dropped
+            
+            for function_name, totals in overflow.items():
+                current = self._metrics_overflow.get(function_name)
+                if current is None:
+                    self._metrics_overflow[function_name] = totals
+                    continue
+                current[0] += totals[0]
+                current[1] += totals[1]
+                current[2] = max(current[2], totals[2])
+                current[3] += totals[3]
+                current[4] += totals[4]
+            self._metrics_columns = columns = tuple(
+                failed + newer for failed, newer in zip(metrics_columns, self._metrics_columns))
+            excess = len(columns[1]) - self.buffer_max_rows
+            if excess > 0:
+                for (timestamp, function_name, execution_time, memory_peak, cpu_usage,
+                     _, _, success_rate, _) in zip(*(column[-excess:] for column in columns)):
+                    self._aggregate_metrics(timestamp, function_name, execution_time,
+                                            memory_peak, cpu_usage, success_rate)
+                for column in columns:
+                    del column[-excess:]
+    
+    def _log_rows(self, entries: List[tuple]) -> List[tuple]:
+        """Encode buffered log values to insert rows, dropping any that cannot be encoded."""
+        rows = []
+        for values in entries:
+            try:
+                rows.append(log_row(*values))
+            except (TypeError, ValueError) as e:
+                self.logger.error(f"Error serializing log entry for {values[2]}: {e}")
+        return rows
+    
+    def close(self) -> None:
+        """Stop the writer, flush buffered rows and close the connection."""
+        self._closed = True
+        self._wake.set()
+        with self._lock:
+            self.flush()
+            self._conn.close()
     
     def query_log_entries(self, filters: LogFilters) -> List[LogEntry]:
         """Query log entries with optional filters."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            
+            self.flush()
             try:
-                query = "SELECT * FROM log_entries WHERE 1=1"
-                params = []
-                
-                if filters.session_id:
-                    query += " AND session_id = ?"
-                    params.append(filters.session_id)
-                
-                if filters.function_name:
-                    query += " AND function_name = ?"
-                    params.append(filters.function_name)
-                
-                if filters.event_type:
-                    query += " AND event_type = ?"
-                    params.append(filters.event_type)
-                
-                if filters.time_range:
-                    query += " AND timestamp BETWEEN ? AND ?"
-                    params.extend([
-                        filters.time_range.start.isoformat(),
-                        filters.time_range.end.isoformat()
-                    ])
-                
-                query += " ORDER BY timestamp DESC"
-                
-                if filters.limit:
-                    query += " LIMIT ?"
-                    params.append(filters.limit)
-                
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                
-                return [LogEntry.from_dict(dict(row)) for row in rows]
-                
+                return self._select_log_entries(filters)
             except Exception as e:
                 self.logger.error(f"Error querying log entries: {e}")
                 raise
-            finally:
-                conn.close()
+    
+    def _select_log_entries(self, filters: LogFilters) -> List[LogEntry]:
+        """Run the log entry query; call under the lock."""
+        query = "SELECT * FROM log_entries WHERE 1=1"
+        params = []
+        
+        if filters.session_id:
+            query += " AND session_id = ?"
+            params.append(filters.session_id)
+        
+        if filters.function_name:
+            query += " AND function_name = ?"
+            params.append(filters.function_name)
+        
+        if filters.event_type:
+            query += " AND event_type = ?"
+            params.append(filters.event_type)
+        
+        if filters.time_range:
+            query += " AND timestamp BETWEEN ? AND ?"
+            params.extend([
+                filters.time_range.start.isoformat(),
+                filters.time_range.end.isoformat()
+            ])
+        
+        query += " ORDER BY timestamp DESC"
+        
+        if filters.limit:
+            query += " LIMIT ?"
+            params.append(filters.limit)
+        
+        rows = self._conn.execute(query, params).fetchall()
+        return [LogEntry.from_dict(dict(row)) for row in rows]
     
     def query_performance_metrics(self, time_range: TimeRange = None, 
                                 function_name: str = None) -> List[PerformanceMetrics]:
         """Query performance metrics with optional filters."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            
+            self.flush()
             try:
-                query = "SELECT * FROM performance_metrics WHERE 1=1"
-                params = []
-                
-                if time_range:
-                    query += " AND timestamp BETWEEN ? AND ?"
-                    params.extend([
-                        time_range.start.isoformat(),
-                        time_range.end.isoformat()
-                    ])
-                
-                if function_name:
-                    query += " AND function_name = ?"
-                    params.append(function_name)
-                
-                query += " ORDER BY timestamp DESC"
-                
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                
-                return [PerformanceMetrics.from_dict(dict(row)) for row in rows]
-                
+                return self._select_performance_metrics(time_range, function_name)
             except Exception as e:
                 self.logger.error(f"Error querying performance metrics: {e}")
                 raise
-            finally:
-                conn.close()
+    
+    def _select_performance_metrics(self, time_range: TimeRange = None,
+                                    function_name: str = None) -> List[PerformanceMetrics]:
+        """Run the performance metrics query; call under the lock."""
+        query = "SELECT * FROM performance_metrics WHERE 1=1"
+        params = []
+        
+        if time_range:
+            query += " AND timestamp BETWEEN ? AND ?"
+            params.extend([
+                time_range.start.isoformat(),
+                time_range.end.isoformat()
+            ])
+        
+        if function_name:
+            query += " AND function_name = ?"
+            params.append(function_name)
+        
+        query += " ORDER BY timestamp DESC"
+        
+        rows = self._conn.execute(query, params).fetchall()
+        return [PerformanceMetrics.from_dict(dict(row)) for row in rows]
+    
+    def query_performance_stats(self, time_range: TimeRange) -> List[Dict[str, Any]]:
+        """Per-function call count, total and max execution time and total memory in time_range.
+        
+        Aggregated by SQLite over the timestamp index instead of loading every row.
+        """
+        with self._lock:
+            self.flush()
+            try:
+                rows = self._conn.execute('''
+                    SELECT function_name, COUNT(*) AS calls, SUM(execution_time) AS total_time,
+                           MAX(execution_time) AS max_time, SUM(memory_peak) AS total_memory
+                    FROM performance_metrics
+                    WHERE timestamp BETWEEN ? AND ?
+                    GROUP BY function_name
+                ''', (time_range.start.isoformat(), time_range.end.isoformat())).fetchall()
+                return [dict(row) for row in rows]
+            except Exception as e:
+                self.logger.error(f"Error querying performance stats: {e}")
+                raise
+    
+    def query_dashboard(self, filters: LogFilters, time_range: TimeRange = None) -> DashboardSnapshot:
+        """Log entries, performance metrics and database stats from one consistent read.
+        
+        One lock acquisition and flush, and a single read transaction, instead of
+        a round trip per query_log_entries, query_performance_metrics and
+        get_database_stats call.
+        """
+        with self._lock:
+            self.flush()
+            conn = self._conn
+            try:
+                conn.execute("BEGIN")
+                try:
+                    return DashboardSnapshot(
+                        log_entries=self._select_log_entries(filters),
+                        performance_metrics=self._select_performance_metrics(time_range),
+                        stats=self._stats()
+                    )
+                finally:
+                    conn.commit()
+            except Exception as e:
+                self.logger.error(f"Error querying dashboard data: {e}")
+                raise
     
     def cleanup_old_data(self) -> None:
         """Clean up old data based on retention policies."""
         config = config_manager.get_config()
         
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
+            self.flush()
+            conn = self._conn
             try:
                 # Calculate cutoff dates
-                log_cutoff = datetime.now() - timedelta(days=config.log_retention_days)
-                summary_cutoff = datetime.now() - timedelta(days=config.summary_retention_days)
+                now = datetime.now()
+                log_cutoff = now - timedelta(days=config.log_retention_days)
+                summary_cutoff = now - timedelta(days=config.summary_retention_days)
                 
                 # Delete old log entries
-                conn.execute(
+                deleted = conn.execute(
                     "DELETE FROM log_entries WHERE timestamp < ?",
                     (log_cutoff.isoformat(),)
-                )
+                ).rowcount
+                conn.execute(self._COUNT_UPDATE, (-deleted, "log_entries_count"))
                 
                 # Delete old performance metrics (keep summary data longer)
-                conn.execute(
+                deleted = conn.execute(
                     "DELETE FROM performance_metrics WHERE timestamp < ?",
                     (summary_cutoff.isoformat(),)
-                )
+                ).rowcount
+                conn.execute(self._COUNT_UPDATE, (-deleted, "performance_metrics_count"))
                 
                 conn.commit()
                 self.logger.info("Old data cleanup completed")
@@ -238,36 +510,55 @@ class DatabaseManager:
                 self.logger.error(f"Error during data cleanup: {e}")
                 conn.rollback()
                 raise
-            finally:
-                conn.close()
     
-    def get_database_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
+    def get_database_stats(self, verify: bool = False) -> Dict[str, Any]:
+        """Get database statistics.
+        
+        Row counts come from counters maintained on write; verify=True counts the
+        rows instead and resets the counters to match, e.g. after rows were
+        changed outside this manager.
+        """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
+            self.flush()
             try:
-                cursor = conn.execute("SELECT COUNT(*) FROM log_entries")
-                log_count = cursor.fetchone()[0]
-                
-                cursor = conn.execute("SELECT COUNT(*) FROM performance_metrics")
-                metrics_count = cursor.fetchone()[0]
-                
-                # Get database file size
-                db_size = Path(self.db_path).stat().st_size if Path(self.db_path).exists() else 0
-                
-                return {
-                    'log_entries_count': log_count,
-                    'performance_metrics_count': metrics_count,
-                    'database_size_bytes': db_size,
-                    'database_path': self.db_path
-                }
-                
+                return self._stats(verify)
             except Exception as e:
                 self.logger.error(f"Error getting database stats: {e}")
                 return {}
-            finally:
-                conn.close()
+    
+    def _stats(self, verify: bool = False) -> Dict[str, Any]:
+        """Row counts and file size; call under the lock."""
+        if verify:
+            log_count, metrics_count = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM log_entries), (SELECT COUNT(*) FROM performance_metrics)"
+            ).fetchone()
+            with self._conn:
+                self._conn.executemany("UPDATE meta SET value = ? WHERE key = ?", (
+                    (log_count, "log_entries_count"),
+                    (metrics_count, "performance_metrics_count"),
+                ))
+        else:
+            counts = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+            log_count = counts.get("log_entries_count", 0)
+            metrics_count = counts.get("performance_metrics_count", 0)
+        
+        # Get database file size, including pages still in the WAL file
+        db_size = sum(
+            Path(path).stat().st_size
+            for path in (self.db_path, self.db_path + "-wal")
+            if Path(path).exists()
+        )
+        
+        return {
+            'log_entries_count': log_count,
+            'performance_metrics_count': metrics_count,
+            'database_size_bytes': db_size,
+            'database_path': self.db_path
+        }
 
 
 # Global database manager instance
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
+
+# Write out any rows still buffered when the interpreter exits
+atexit.register(db_manager.flush)
\ No newline at end of file
@@ -1,51 +1,236 @@
 """Function decorators for monitoring execution and performance."""
 import functools
+import itertools
+import reprlib
+import secrets
+import threading
 import time
 import traceback
 import psutil
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
-import uuid
 import logging
 
-from .core import ensure_initialized
+from .config import config_manager
+from .core import ensure_initialized, monitoring_system
 from .event_bus import event_bus
 from .database import db_manager
-from .models import LogEntry, PerformanceMetrics
+from .models import FunctionEvent
+
+# One Process handle for the life of the process; building it per call re-reads /proc.
+# The bound method skips the attribute lookup on every decorated call.
+_PROC = psutil.Process(os.getpid())
+_memory_info = _PROC.memory_info
+
+# cpu_percent() only means something over an interval, so a daemon thread samples
+# it once a second and decorated calls record the latest value. The thread starts
+# with the first call long enough to be sampled and exits once monitoring shuts down.
+_cpu_usage = 0.0
+_cpu_sampling = False
+_cpu_lock = threading.Lock()
+
+
+def _sample_cpu() -> None:
+    global _cpu_usage, _cpu_sampling
+    proc = _PROC
+    try:
+        while monitoring_system.initialized:
+            _cpu_usage = proc.cpu_percent(interval=1.0)
+    except psutil.Error:
+        pass
+    finally:
+        _cpu_sampling = False
+
+
+def _start_cpu_sampler() -> None:
+    """Start the CPU sampler unless one is already running."""
+    global _cpu_sampling
+    with _cpu_lock:
+        if _cpu_sampling:
+            return
+        _cpu_sampling = True
+    threading.Thread(target=_sample_cpu, name="monitoring-cpu-sampler", daemon=True).start()
+
+
+# Read on every sampled call, so kept in a module global and refreshed whenever
+# the configuration is loaded or updated
+_min_sample_duration = config_manager.get_config().min_sample_duration
+
+
+def _refresh_settings(config) -> None:
+    global _min_sample_duration
+    _min_sample_duration = config.min_sample_duration
+
+
+config_manager.register_callback(_refresh_settings)
+
+# Session ids are a random per-process prefix plus a counter: unique across runs
+# without generating a UUID on every decorated call
+_SESSION_PREFIX = secrets.token_hex(3)
+_session_counter = itertools.count()
+
+
+def _next_session_id() -> str:
+    return f"{_SESSION_PREFIX}{next(_session_counter):x}"
+
+
+def _rebind_process() -> None:
+    """Point the cached handle at the child and give it its own session prefix after a fork.
+    
+    The parent's CPU sampler thread does not exist in the child; the child's first
+    sampled call starts its own.
+    """
+    global _PROC, _memory_info, _SESSION_PREFIX, _session_counter, _cpu_sampling, _cpu_lock
+    _PROC = psutil.Process(os.getpid())
+    _memory_info = _PROC.memory_info
+    _SESSION_PREFIX = secrets.token_hex(3)
+    _session_counter = itertools.count()
+    _cpu_sampling = False
+    _cpu_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_rebind_process)
+
+# Bounded repr for argument/result summaries: large containers are elided while
+# the repr is built, instead of stringifying everything and slicing afterwards
+_REPR = reprlib.Repr()
+_REPR.maxstring = _REPR.maxother = 200
+_REPR.maxlist = _REPR.maxtuple = _REPR.maxdict = _REPR.maxset = 4
+
+
+def _traceback_text() -> Optional[str]:
+    """Traceback of the exception being handled, or None when not configured to keep it."""
+    config = config_manager.get_config()
+    if not config.capture_traceback:
+        return None
+    return traceback.format_exc(limit=-config.traceback_max_frames)
+
+
+def _function_name(func) -> str:
+    """Qualified name recorded for func; computed once when a decorator wraps it."""
+    return f"{func.__module__}.{func.__name__}"
+
+
+def _layers(func) -> frozenset:
+    """Monitoring layers ('exec', 'perf', 'progress') already wrapping func."""
+    return getattr(func, '__monitoring_layers__', frozenset())
+
+
+def _mark_layers(func, wrapper, *layers: str):
+    """Record on wrapper the layers it adds on top of those already wrapping func."""
+    wrapper.__monitoring_layers__ = _layers(func).union(layers)
+    return wrapper
+
+
+def _disabled() -> bool:
+    """Whether monitoring is switched off, in which case decorators return the bare function.
+    
+    Only called when a function is decorated, never per call.
+    """
+    return not config_manager.get_config().enabled
+
+
+def _memory_peak(duration: float) -> int:
+    """Resident memory after a call, or 0 for calls shorter than min_sample_duration.
+    
+    Sampled calls also make sure the CPU sampler is running.
+    """
+    if duration < _min_sample_duration:
+        return 0
+    if not _cpu_sampling:
+        _start_cpu_sampler()
+    return _memory_info().rss
+
+
+def _summary(value: Any) -> str:
+    """Short printable summary of value, at most 200 characters plus an ellipsis."""
+    text = _REPR.repr(value)
+    return text[:200] + '...' if len(text) > 200 else text
+
+
+class BatchedEmitter:
+    """Collects completed-call records and publishes them as one event per batch.
+    
+    Subscribers to 'function.batch' get {'calls': [(function_name, end_time,
+    duration), ...]} once flush_every calls have completed, or when flush() is
+    called or a ``with`` block around the work exits.
+    """
+    
+    def __init__(self, event_type: str = 'function.batch', flush_every: int = 64):
+        self.event_type = event_type
+        self.flush_every = flush_every
+        self._calls = []
+        self._lock = threading.Lock()
+    
+    def push(self, function_name: str, end_time: datetime, duration: float) -> None:
+        """Record a completed call, publishing the batch once it is full."""
+        with self._lock:
+            self._calls.append((function_name, end_time, duration))
+            if len(self._calls) < self.flush_every:
+                return
+            calls, self._calls = self._calls, []
+        event_bus.publish(self.event_type, {'calls': calls})
+    
+    def flush(self) -> None:
+        """Publish any calls recorded since the last batch."""
+        with self._lock:
+            calls, self._calls = self._calls, []
+        if calls:
+            event_bus.publish(self.event_type, {'calls': calls})
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.flush()
+        return False
+
+
+# Shared by the decorators; only fed while someone subscribes to 'function.batch'
+function_batches = BatchedEmitter()
 
 
 def monitor_execution(func):
     """Decorator to monitor function execution, parameters, and outcomes."""
+    # Stacking the same layer twice would record every call twice
+    if _disabled() or 'exec' in _layers(func):
+        return func
+    
+    # Resolved once per decorated function rather than on every call
+    func_name = _function_name(func)
+    _now = datetime.now
+    _perf = time.perf_counter
+    _has = event_bus.has
+    _publish = event_bus.publish
+    _record_log = db_manager.record_log
+    _push_call = function_batches.push
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         ensure_initialized()
         
         # Generate session ID for this execution
-        session_id = str(uuid.uuid4())[:8]
-        func_name = f"{func.__module__}.{func.__name__}"
-        start_time = datetime.now()
+        session_id = _next_session_id()
+        # One wall-clock read for stored timestamps; durations use the monotonic counter
+        start_time = _now()
+        t0 = _perf()
         
         # Log function start
-        start_entry = LogEntry(
-            timestamp=start_time,
-            session_id=session_id,
-            function_name=func_name,
-            event_type='start',
-            parameters={
-                'args_count': len(args),
-                'kwargs_keys': list(kwargs.keys()),
-                'args_summary': str(args)[:200] + '...' if len(str(args)) > 200 else str(args)
-            }
-        )
-        
         try:
-            db_manager.insert_log_entry(start_entry)
-            event_bus.publish('function.started', {
-                'function_name': func_name,
-                'session_id': session_id,
-                'timestamp': start_time.isoformat()
+            _record_log(start_time, session_id, func_name, 'start', None, {
+                'args_count': len(args),
+                'kwargs_keys': tuple(kwargs),
+                'args_summary': _summary(args)
             })
+            if _has('function.started'):
+                _publish('function.started', FunctionEvent(
+                    function_name=func_name,
+                    session_id=session_id,
+                    status='started',
+                    timestamp=start_time.isoformat()
+                ))
         except Exception as e:
             logging.error(f"Error logging function start: {e}")
         
@@ -54,26 +239,21 @@ def monitor_execution(func):
             result = func(*args, **kwargs)
             
             # Log successful completion
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            complete_entry = LogEntry(
-                timestamp=end_time,
-                session_id=session_id,
-                function_name=func_name,
-                event_type='complete',
-                duration=duration,
-                result_summary=str(result)[:200] + '...' if len(str(result)) > 200 else str(result)
-            )
+            duration = _perf() - t0
+            end_time = start_time + timedelta(seconds=duration)
             
             try:
-                db_manager.insert_log_entry(complete_entry)
-                event_bus.publish('function.completed', {
-                    'function_name': func_name,
-                    'session_id': session_id,
-                    'duration': duration,
-                    'timestamp': end_time.isoformat()
-                })
+                _record_log(end_time, session_id, func_name, 'complete', duration, None, _summary(result))
+                if _has('function.completed'):
+                    _publish('function.completed', FunctionEvent(
+                        function_name=func_name,
+                        session_id=session_id,
+                        status='completed',
+                        timestamp=end_time.isoformat(),
+                        duration=duration
+                    ))
+                if _has('function.batch'):
+                    _push_call(func_name, end_time, duration)
             except Exception as e:
                 logging.error(f"Error logging function completion: {e}")
             
@@ -81,81 +261,71 @@ def monitor_execution(func):
             
         except Exception as error:
             # Log error
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            error_entry = LogEntry(
-                timestamp=end_time,
-                session_id=session_id,
-                function_name=func_name,
-                event_type='error',
-                duration=duration,
-                error_details=str(error),
-                parameters={
-                    'args_count': len(args),
-                    'kwargs_keys': list(kwargs.keys()),
-                    'traceback': traceback.format_exc()
-                }
-            )
+            duration = _perf() - t0
+            end_time = start_time + timedelta(seconds=duration)
             
             try:
-                db_manager.insert_log_entry(error_entry)
-                event_bus.publish('function.failed', {
-                    'function_name': func_name,
-                    'session_id': session_id,
-                    'error': str(error),
-                    'duration': duration,
-                    'timestamp': end_time.isoformat()
-                })
+                _record_log(end_time, session_id, func_name, 'error', duration, {
+                    'args_count': len(args),
+                    'kwargs_keys': tuple(kwargs),
+                    'traceback': _traceback_text()
+                }, None, str(error))
+                if _has('function.failed'):
+                    _publish('function.failed', FunctionEvent(
+                        function_name=func_name,
+                        session_id=session_id,
+                        status='failed',
+                        timestamp=end_time.isoformat(),
+                        duration=duration,
+                        error=str(error)
+                    ))
             except Exception as e:
                 logging.error(f"Error logging function error: {e}")
             
             raise  # Re-raise the original error
     
-    return wrapper
+    return _mark_layers(func, wrapper, 'exec')
 
 
 def track_performance(func):
     """Decorator to track performance metrics like execution time and memory usage."""
+    if _disabled() or 'perf' in _layers(func):
+        return func
+    
+    # Resolved once per decorated function rather than on every call
+    func_name = _function_name(func)
+    _now = datetime.now
+    _perf = time.perf_counter
+    _has = event_bus.has
+    _publish = event_bus.publish
+    _record_metrics = db_manager.record_performance
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         ensure_initialized()
         
-        func_name = f"{func.__module__}.{func.__name__}"
-        start_time = datetime.now()
-        
-        # Get initial memory usage
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss
+        # One wall-clock read for stored timestamps; durations use the monotonic counter
+        start_time = _now()
+        t0 = _perf()
         
         try:
             # Execute function
             result = func(*args, **kwargs)
             
             # Calculate metrics
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
-            final_memory = process.memory_info().rss
-            memory_peak = max(initial_memory, final_memory)
-            
-            # Create performance metrics
-            metrics = PerformanceMetrics(
-                timestamp=end_time,
-                function_name=func_name,
-                execution_time=execution_time,
-                memory_peak=memory_peak,
-                cpu_usage=process.cpu_percent(),
-                success_rate=1.0
-            )
+            execution_time = _perf() - t0
+            end_time = start_time + timedelta(seconds=execution_time)
+            memory_peak = _memory_peak(execution_time)
             
             try:
-                db_manager.insert_performance_metrics(metrics)
-                event_bus.publish('performance.recorded', {
-                    'function_name': func_name,
-                    'execution_time': execution_time,
-                    'memory_peak': memory_peak,
-                    'timestamp': end_time.isoformat()
-                })
+                _record_metrics(end_time, func_name, execution_time, memory_peak, _cpu_usage, 1.0)
+                if _has('performance.recorded'):
+                    _publish('performance.recorded', {
+                        'function_name': func_name,
+                        'execution_time': execution_time,
+                        'memory_peak': memory_peak,
+                        'timestamp': end_time.isoformat()
+                    })
             except Exception as e:
                 logging.error(f"Error recording performance metrics: {e}")
             
@@ -163,79 +333,199 @@ def track_performance(func):
             
         except Exception as error:
             # Record failed execution
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
-            final_memory = process.memory_info().rss
-            memory_peak = max(initial_memory, final_memory)
-            
-            metrics = PerformanceMetrics(
-                timestamp=end_time,
-                function_name=func_name,
-                execution_time=execution_time,
-                memory_peak=memory_peak,
-                cpu_usage=process.cpu_percent(),
-                success_rate=0.0
-            )
+            execution_time = _perf() - t0
+            end_time = start_time + timedelta(seconds=execution_time)
+            memory_peak = _memory_peak(execution_time)
             
             try:
-                db_manager.insert_performance_metrics(metrics)
+                _record_metrics(end_time, func_name, execution_time, memory_peak, _cpu_usage, 0.0)
             except Exception as e:
                 logging.error(f"Error recording failed performance metrics: {e}")
             
             raise  # Re-raise the original error
     
-    return wrapper
+    return _mark_layers(func, wrapper, 'perf')
 
 
 def progress_step(weight: float = 1.0):
-    """Decorator to mark functions as progress steps with relative weights."""
+    """Decorator to mark functions as progress steps with relative weights.
+    
+    Publishes one 'progress.step' event when the step finishes, successfully or
+    not; a weighted progress bar only needs the finished steps.
+    """
     def decorator(func):
+        if _disabled() or 'progress' in _layers(func):
+            return func
+        
+        # Resolved once per decorated function rather than on every call
+        func_name = _function_name(func)
+        _perf = time.perf_counter
+        _has = event_bus.has
+        _publish = event_bus.publish
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             ensure_initialized()
             
-            func_name = f"{func.__module__}.{func.__name__}"
+            t0 = _perf()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as error:
+                if _has('progress.step'):
+                    _publish('progress.step', {
+                        'function_name': func_name,
+                        'weight': weight,
+                        'duration': _perf() - t0,
+                        'status': 'error',
+                        'error': str(error)
+                    })
+                raise
             
-            # Publish progress step start
-            event_bus.publish('progress.step_started', {
-                'function_name': func_name,
-                'weight': weight,
-                'timestamp': datetime.now().isoformat()
+            if _has('progress.step'):
+                _publish('progress.step', {
+                    'function_name': func_name,
+                    'weight': weight,
+                    'duration': _perf() - t0,
+                    'status': 'ok',
+                    'error': None
+                })
+            return result
+        
+        return _mark_layers(func, wrapper, 'progress')
+    return decorator
+
+
+def _monitor_all_impl(func, weight: float):
+    """Single wrapper recording what monitor_execution, track_performance and
+    progress_step record together, with one frame and one clock read each side."""
+    # Resolved once per decorated function rather than on every call
+    func_name = _function_name(func)
+    _now = datetime.now
+    _perf = time.perf_counter
+    _has = event_bus.has
+    _publish = event_bus.publish
+    _record_log = db_manager.record_log
+    _push_call = function_batches.push
+    _record_metrics = db_manager.record_performance
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        ensure_initialized()
+        
+        session_id = _next_session_id()
+        start_time = _now()
+        t0 = _perf()
+        
+        try:
+            _record_log(start_time, session_id, func_name, 'start', None, {
+                'args_count': len(args),
+                'kwargs_keys': tuple(kwargs),
+                'args_summary': _summary(args)
             })
+            if _has('function.started'):
+                _publish('function.started', FunctionEvent(
+                    function_name=func_name,
+                    session_id=session_id,
+                    status='started',
+                    timestamp=start_time.isoformat()
+                ))
+        except Exception as e:
+            logging.error(f"Error logging function start: {e}")
+        
+        try:
+            result = func(*args, **kwargs)
+        except Exception as error:
+            duration = _perf() - t0
+            end_time = start_time + timedelta(seconds=duration)
+            end_iso = end_time.isoformat()
+            memory_peak = _memory_peak(duration)
             
             try:
-                result = func(*args, **kwargs)
-                
-                # Publish progress step completion
-                event_bus.publish('progress.step_completed', {
+                _record_log(end_time, session_id, func_name, 'error', duration, {
+                    'args_count': len(args),
+                    'kwargs_keys': tuple(kwargs),
+                    'traceback': _traceback_text()
+                }, None, str(error))
+                if _has('function.failed'):
+                    _publish('function.failed', FunctionEvent(
+                        function_name=func_name,
+                        session_id=session_id,
+                        status='failed',
+                        timestamp=end_iso,
+                        duration=duration,
+                        error=str(error)
+                    ))
+                _record_metrics(end_time, func_name, duration, memory_peak, _cpu_usage, 0.0)
+            except Exception as e:
+                logging.error(f"Error logging function error: {e}")
+            
+            if _has('progress.step'):
+                _publish('progress.step', {
                     'function_name': func_name,
                     'weight': weight,
-                    'timestamp': datetime.now().isoformat()
+                    'duration': duration,
+                    'status': 'error',
+                    'error': str(error)
                 })
-                
-                return result
-                
-            except Exception as error:
-                # Publish progress step failure
-                event_bus.publish('progress.step_failed', {
+            raise  # Re-raise the original error
+        
+        duration = _perf() - t0
+        end_time = start_time + timedelta(seconds=duration)
+        end_iso = end_time.isoformat()
+        memory_peak = _memory_peak(duration)
+        
+        try:
+            _record_log(end_time, session_id, func_name, 'complete', duration, None, _summary(result))
+            if _has('function.completed'):
+                _publish('function.completed', FunctionEvent(
+                    function_name=func_name,
+                    session_id=session_id,
+                    status='completed',
+                    timestamp=end_iso,
+                    duration=duration
+                ))
+            if _has('function.batch'):
+                _push_call(func_name, end_time, duration)
+            _record_metrics(end_time, func_name, duration, memory_peak, _cpu_usage, 1.0)
+            if _has('performance.recorded'):
+                _publish('performance.recorded', {
                     'function_name': func_name,
-                    'weight': weight,
-                    'error': str(error),
-                    'timestamp': datetime.now().isoformat()
+                    'execution_time': duration,
+                    'memory_peak': memory_peak,
+                    'timestamp': end_iso
                 })
-                raise
+        except Exception as e:
+            logging.error(f"Error recording function completion: {e}")
         
-        return wrapper
-    return decorator
+        if _has('progress.step'):
+            _publish('progress.step', {
+                'function_name': func_name,
+                'weight': weight,
+                'duration': duration,
+                'status': 'ok',
+                'error': None
+            })
+        return result
+    
+    return _mark_layers(func, wrapper, 'exec', 'perf', 'progress')
 
 
 # Convenience decorator that combines monitoring and performance tracking
 def monitor_all(weight: float = 1.0):
     """Decorator that combines execution monitoring, performance tracking, and progress tracking."""
     def decorator(func):
-        # Apply all decorators
-        decorated_func = monitor_execution(func)
-        decorated_func = track_performance(decorated_func)
-        decorated_func = progress_step(weight)(decorated_func)
-        return decorated_func
+        present = _layers(func)
+        if _disabled() or present >= {'exec', 'perf', 'progress'}:
+            return func
+        if not present:
+            # One wrapper instead of stacking the three decorators above
+            return _monitor_all_impl(func, weight)
+        # Some layers already wrap func: add only the missing ones so no call is recorded twice
+        if 'exec' not in present:
+            func = monitor_execution(func)
+        if 'perf' not in present:
+            func = track_performance(func)
+        if 'progress' not in present:
+            func = progress_step(weight)(func)
+        return func
     return decorator
\ No newline at end of file
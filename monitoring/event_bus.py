@@ -1,54 +1,140 @@
 """Event bus for real-time communication between monitoring components."""
+import contextlib
+import queue
 import threading
-from typing import Dict, List, Callable, Any
-from collections import defaultdict
+from typing import Dict, Callable, Any, Tuple, Iterable, Iterator
 import logging
 
 
 class EventBus:
-    """Central message broker for real-time communication between components."""
+    """Central message broker for real-time communication between components.
+    
+    Subscriptions are copy-on-write: writers build a new mapping of event type to
+    immutable (sync, async) handler tuples and rebind it under the lock, so publish
+    reads a consistent snapshot without locking. Async handlers run on a daemon
+    worker thread, so publishing costs the caller a single queue put.
+    """
     
     def __init__(self):
-        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        self._lock = threading.RLock()
+        # Only event types with handlers: event_type -> (sync handlers, async handlers)
+        self._subscribers: Dict[str, Tuple[Tuple[Callable, ...], Tuple[Callable, ...]]] = {}
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._dispatch_loop, name="event-bus", daemon=True)
+        self._worker.start()
     
-    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
-        """Publish an event to all subscribers."""
-        with self._lock:
-            subscribers = self._subscribers.get(event_type, [])
-            
-        for handler in subscribers:
+    def _dispatch(self, handlers: Tuple[Callable, ...], event_type: str, data: Any) -> None:
+        """Invoke handlers in order, logging rather than propagating their errors."""
+        for handler in handlers:
             try:
                 handler(event_type, data)
             except Exception as e:
                 self.logger.error(f"Error in event handler for {event_type}: {e}")
     
-    def subscribe(self, event_type: str, handler: Callable[[str, Dict], None]) -> None:
-        """Subscribe to events of a specific type."""
+    def _dispatch_loop(self) -> None:
+        """Worker thread: run queued async handlers; an Event in the queue marks a drain point."""
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            self._dispatch(*item)
+    
+    def publish(self, event_type: str, data: Any) -> None:
+        """Publish an event: sync subscribers run inline, the rest on the worker thread.
+        
+        The same data object is handed to every subscriber, so handlers must not mutate it.
+        """
+        handlers = self._subscribers.get(event_type)
+        if handlers is None:
+            return
+        sync_handlers, async_handlers = handlers
+        if sync_handlers:
+            self._dispatch(sync_handlers, event_type, data)
+        if async_handlers:
+            self._queue.put_nowait((async_handlers, event_type, data))
+    
+    def publish_sync(self, event_type: str, data: Any) -> None:
+        """Publish an event to every subscriber on the calling thread."""
+        sync_handlers, async_handlers = self._subscribers.get(event_type, ((), ()))
+        self._dispatch(sync_handlers + async_handlers, event_type, data)
+    
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until events published so far have been handled; False on timeout."""
+        if threading.current_thread() is self._worker:
+            return True
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        return done.wait(timeout)
+    
+    def _replace(self, event_type: str, handlers: Tuple[Tuple[Callable, ...], Tuple[Callable, ...]]) -> None:
+        """Rebind the subscriber mapping with event_type's handlers replaced; call under the lock."""
+        subscribers = dict(self._subscribers)
+        if handlers[0] or handlers[1]:
+            subscribers[event_type] = handlers
+        else:
+            subscribers.pop(event_type, None)
+        self._subscribers = subscribers
+    
+    def subscribe(self, event_type: str, handler: Callable[[str, Dict], None], sync: bool = False) -> None:
+        """Subscribe to events of a specific type.
+        
+        Handlers run on the worker thread unless sync=True, which runs them inline
+        in publish, in order with the publisher.
+        """
         with self._lock:
-            self._subscribers[event_type].append(handler)
+            sync_handlers, async_handlers = self._subscribers.get(event_type, ((), ()))
+            if sync:
+                sync_handlers += (handler,)
+            else:
+                async_handlers += (handler,)
+            self._replace(event_type, (sync_handlers, async_handlers))
             self.logger.debug(f"Subscribed handler to {event_type}")
     
     def unsubscribe(self, event_type: str, handler: Callable[[str, Dict], None]) -> None:
         """Unsubscribe from events of a specific type."""
         with self._lock:
-            if handler in self._subscribers[event_type]:
-                self._subscribers[event_type].remove(handler)
-                self.logger.debug(f"Unsubscribed handler from {event_type}")
+            handlers = [list(group) for group in self._subscribers.get(event_type, ((), ()))]
+            for group in handlers:
+                if handler in group:
+                    group.remove(handler)
+                    self._replace(event_type, (tuple(handlers[0]), tuple(handlers[1])))
+                    self.logger.debug(f"Unsubscribed handler from {event_type}")
+                    return
+    
+    @contextlib.contextmanager
+    def subscription(self, event_types: Iterable[str], handler: Callable[[str, Dict], None],
+                     sync: bool = False) -> Iterator["EventBus"]:
+        """Subscribe handler to several event types for the duration of a with block.
+        
+        The handler is unsubscribed from every type on exit, even if the block raises.
+        """
+        event_types = tuple(event_types)
+        for event_type in event_types:
+            self.subscribe(event_type, handler, sync=sync)
+        try:
+            yield self
+        finally:
+            for event_type in event_types:
+                self.unsubscribe(event_type, handler)
+    
+    def has(self, event_type: str) -> bool:
+        """Whether anyone listens for event_type; lets publishers skip building payloads."""
+        return event_type in self._subscribers
     
     def get_subscriber_count(self, event_type: str) -> int:
         """Get number of subscribers for an event type."""
-        with self._lock:
-            return len(self._subscribers.get(event_type, []))
+        sync_handlers, async_handlers = self._subscribers.get(event_type, ((), ()))
+        return len(sync_handlers) + len(async_handlers)
     
     def clear_subscribers(self, event_type: str = None) -> None:
         """Clear all subscribers for an event type, or all if None."""
         with self._lock:
             if event_type:
-                self._subscribers[event_type].clear()
+                self._replace(event_type, ((), ()))
             else:
-                self._subscribers.clear()
+                self._subscribers = {}
 
 
 # Global event bus instance
@@ -1,9 +1,13 @@
 """Logging setup and configuration for the monitoring system."""
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
 from .config import config_manager
 
+# Background listener that formats and writes records; see setup_logging
+_listener = None
+
 
 def setup_logging():
     """Set up logging configuration for the monitoring system."""
@@ -18,6 +22,7 @@ def setup_logging():
     logger.setLevel(getattr(logging, config.log_level.upper(), logging.INFO))
     
     # Clear existing handlers
+    stop_logging()
     logger.handlers.clear()
     
     # Console handler
@@ -26,7 +31,6 @@ def setup_logging():
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
@@ -38,7 +42,16 @@ def setup_logging():
         '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    
+    # Log calls only enqueue the record; formatting, console and file I/O and
+    # rotation happen on the listener thread
+    global _listener
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
     
     # Set specific logger levels
     logging.getLogger('monitoring').setLevel(getattr(logging, config.log_level.upper()))
@@ -46,6 +59,22 @@ def setup_logging():
     return logger
 
 
+def stop_logging():
+    """Flush queued records and write any later ones directly to the handlers."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    
+    logger = logging.getLogger()
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+            logger.removeHandler(handler)
+            for target in listener.handlers:
+                logger.addHandler(target)
+
+
 def update_log_level(new_level: str):
     """Update logging level dynamically."""
     logger = logging.getLogger()
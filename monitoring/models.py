@@ -1,11 +1,41 @@
 """Data models for the monitoring system."""
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import json
+import sys
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
 
-@dataclass
+# Drop the per-instance __dict__ where dataclasses support it (Python 3.10+);
+# the decorators allocate these on every monitored call
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def log_row(timestamp: datetime, session_id: str, function_name: str, event_type: str,
+            duration: Optional[float] = None, parameters: Optional[Dict[str, Any]] = None,
+            result_summary: Optional[str] = None, error_details: Optional[str] = None,
+            memory_usage: Optional[int] = None, metadata: Optional[Dict[str, Any]] = None) -> Tuple:
+    """Values in log_entries insert order, with the timestamp and JSON fields encoded."""
+    return (
+        timestamp.isoformat(), session_id, function_name, event_type, duration,
+        _json_dumps(parameters) if parameters else None,
+        result_summary, error_details, memory_usage,
+        _json_dumps(metadata) if metadata else None
+    )
+
+
+@dataclass(**_SLOTS)
 class LogEntry:
     timestamp: datetime
     session_id: str
@@ -26,13 +56,21 @@ class LogEntry:
             'function_name': self.function_name,
             'event_type': self.event_type,
             'duration': self.duration,
-            'parameters': json.dumps(self.parameters) if self.parameters else None,
+            'parameters': _json_dumps(self.parameters) if self.parameters else None,
             'result_summary': self.result_summary,
             'error_details': self.error_details,
             'memory_usage': self.memory_usage,
-            'metadata': json.dumps(self.metadata) if self.metadata else None
+            'metadata': _json_dumps(self.metadata) if self.metadata else None
         }
     
+    def to_row(self) -> Tuple:
+        """Values in log_entries insert order, without building the dict."""
+        return log_row(
+            self.timestamp, self.session_id, self.function_name, self.event_type,
+            self.duration, self.parameters, self.result_summary, self.error_details,
+            self.memory_usage, self.metadata
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'LogEntry':
         """Create LogEntry from dictionary."""
@@ -50,7 +88,7 @@ class LogEntry:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PerformanceMetrics:
     timestamp: datetime
     function_name: str
@@ -76,6 +114,14 @@ class PerformanceMetrics:
             'session_id': self.session_id
         }
     
+    def to_row(self) -> Tuple:
+        """Values in performance_metrics insert order, without building the dict."""
+        return (
+            self.timestamp.isoformat(), self.function_name, self.execution_time,
+            self.memory_peak, self.cpu_usage, self.api_calls_count,
+            self.db_queries_count, self.success_rate, self.session_id
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PerformanceMetrics':
         """Create PerformanceMetrics from dictionary."""
@@ -92,7 +138,30 @@ class PerformanceMetrics:
         )
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
+class FunctionEvent:
+    """Payload of function.started/completed/failed events.
+    
+    Immutable, so every subscriber can be handed the same instance; get() keeps
+    handlers written against the old dict payloads working.
+    """
+    function_name: str
+    session_id: str
+    status: str  # 'started', 'completed', 'failed'
+    timestamp: str
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style field access."""
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+@dataclass(**_SLOTS)
 class ProgressState:
     session_id: str
     current_step: str
@@ -117,7 +186,7 @@ class ProgressState:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TimeRange:
     start: datetime
     end: datetime
@@ -127,7 +196,7 @@ class TimeRange:
         return self.start <= timestamp <= self.end
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class LogFilters:
     session_id: Optional[str] = None
     function_name: Optional[str] = None
@@ -136,7 +205,14 @@ class LogFilters:
     limit: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
+class DashboardSnapshot:
+    log_entries: List[LogEntry]
+    performance_metrics: List[PerformanceMetrics]
+    stats: Dict[str, Any]
+
+
+@dataclass(**_SLOTS)
 class PerformanceSummary:
     time_range: TimeRange
     total_executions: int
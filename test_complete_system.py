@@ -4,6 +4,8 @@ import os
 import time
 from datetime import datetime, timedelta
 
+import pytest
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from monitoring.core import monitoring_system, ensure_initialized
@@ -17,6 +19,9 @@ def test_complete_monitoring_system():
     print("🚀 Testing Complete Monitoring System")
     print("=" * 50)
     
+    # main_monitored needs the ML stack; skip rather than fail where it is not installed
+    pytest.importorskip("torch")
+    
     # Initialize monitoring
     ensure_initialized()
     print("✓ Monitoring system initialized")
@@ -27,6 +32,7 @@ def test_complete_monitoring_system():
         conn = sqlite3.connect(monitoring_system.logger.handlers[1].baseFilename.replace('.log', '.db') if len(monitoring_system.logger.handlers) > 1 else 'monitoring.db')
         conn.execute("DELETE FROM log_entries")
         conn.execute("DELETE FROM performance_metrics")
+        conn.execute("UPDATE meta SET value = 0")
         conn.commit()
         conn.close()
     except:
@@ -42,7 +48,7 @@ def test_complete_monitoring_system():
     # Subscribe to all monitoring events
     event_types = [
         'function.started', 'function.completed', 'function.failed',
-        'progress.step_started', 'progress.step_completed', 
+        'progress.step', 
         'performance.recorded'
     ]
     
@@ -53,8 +59,8 @@ def test_complete_monitoring_system():
     print("-" * 40)
     
     # Import and run the monitored main function
+    from main_monitored import main
     try:
-        from main_monitored import main
         start_time = time.time()
         result = main()
         end_time = time.time()
@@ -81,10 +87,8 @@ def test_complete_monitoring_system():
     print(f"✓ Log entries: {len(log_entries)}")
     
     # Check performance metrics
-    time_range = TimeRange(
-        start=datetime.now() - timedelta(minutes=5),
-        end=datetime.now() + timedelta(minutes=1)
-    )
+    now = datetime.now()
+    time_range = TimeRange(start=now - timedelta(minutes=5), end=now + timedelta(minutes=1))
     perf_metrics = db_manager.query_performance_metrics(time_range)
     print(f"✓ Performance metrics: {len(perf_metrics)}")
     
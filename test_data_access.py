@@ -0,0 +1,206 @@
+"""Tests for the viral movements data access layer."""
+import sys
+import os
+import csv
+import json
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_access import ViralMovementsDataAccess, SQLiteMovementsDataAccess, stream_filter_movements
+
+
+def _make_movement(i, platform, score, views, growth, age, title, transcript=""):
+    return {
+        "id": f"mv_{i}",
+        "title": title,
+        "platform": platform,
+        "views": views,
+        "age_hours": age,
+        "growth_6h": growth,
+        "transcript": transcript,
+        "scores": {"final_score": score},
+    }
+
+
+SAMPLE_MOVEMENTS = [
+    _make_movement(0, "youtube", 22.3, 250000, 4.2, 8.5, "INSANE Gaming Moment", "epic plays"),
+    _make_movement(1, "tiktok", 19.7, 180000, 3.8, 12.0, "Monday mood", "relatable meme"),
+    _make_movement(2, "instagram", 14.2, 95000, 2.9, 18.5, "Pro Gamer", "gaming highlights"),
+    _make_movement(3, "youtube", 19.7, 120000, 3.1, 30.0, "Speedrun record", "any% run"),
+    _make_movement(4, "tiktok", 9.5, 40000, 1.2, 2.0, "Cat video", "MEMES only"),
+]
+
+
+def _data_access(tmp_dir, store_cls=ViralMovementsDataAccess):
+    filename = "movements.db" if store_cls is SQLiteMovementsDataAccess else "movements.json"
+    data_access = store_cls(os.path.join(tmp_dir, filename))
+    data_access.add_movements(SAMPLE_MOVEMENTS)
+    return data_access
+
+
+def _ids(movements):
+    return [m["id"] for m in movements]
+
+
+def test_filter_movements():
+    """Test key-value filters against the sample movements."""
+    for store_cls in (ViralMovementsDataAccess, SQLiteMovementsDataAccess):
+        _check_filters(store_cls)
+    print("✓ Filters working")
+
+
+def _check_filters(store_cls):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = _data_access(tmp_dir, store_cls)
+
+        assert _ids(data_access.filter_movements()) == ["mv_0", "mv_1", "mv_3", "mv_2", "mv_4"]
+        assert _ids(data_access.filter_movements(platform="youtube")) == ["mv_0", "mv_3"]
+        assert _ids(data_access.filter_movements(min_views=100000, max_views=200000)) == ["mv_1", "mv_3"]
+        assert _ids(data_access.filter_movements(min_score=10, max_score=20)) == ["mv_1", "mv_3", "mv_2"]
+        assert _ids(data_access.filter_movements(min_growth=3.0, max_age_hours=24)) == ["mv_0", "mv_1"]
+        assert _ids(data_access.filter_movements(keywords=["GAMING", "memes"])) == ["mv_0", "mv_2", "mv_4"]
+        assert _ids(data_access.filter_movements(keywords=["nothing"])) == []
+        assert _ids(data_access.get_top_movements(limit=3)) == ["mv_0", "mv_1", "mv_3"]
+        stats = data_access.get_summary()["statistics"]
+        assert stats["platforms"] == {"youtube": 2, "tiktok": 2, "instagram": 1}
+        assert (stats["max_score"], stats["min_score"], stats["max_views"]) == (22.3, 9.5, 250000)
+        assert (stats["high_score_movements"], stats["trending_movements"]) == (3, 3)
+        assert abs(stats["avg_score"] - 17.08) < 1e-9
+        data_access.flush()
+
+
+def test_filter_movements_limit():
+    """Test top-K selection keeps score order and insertion order for ties."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = _data_access(tmp_dir)
+
+        assert _ids(data_access.get_top_movements(limit=2)) == ["mv_0", "mv_1"]
+        assert _ids(data_access.get_top_movements(limit=3)) == ["mv_0", "mv_1", "mv_3"]
+        assert _ids(data_access.get_top_movements(limit=0)) == []
+        assert len(data_access.get_movements_by_score(limit=None)) == len(SAMPLE_MOVEMENTS)
+        data_access.flush()
+        print("✓ Limits working")
+
+
+def test_add_movements_replaces_existing_id():
+    """Test re-adding a movement replaces it and persists to disk."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = _data_access(tmp_dir)
+        assert _ids(data_access.get_top_movements(limit=1)) == ["mv_0"]
+        data_access.add_movements([_make_movement(2, "instagram", 30.0, 95000, 2.9, 18.5, "Pro Gamer")])
+
+        # Cached filter results are dropped when the movements change
+        assert _ids(data_access.get_all_movements()) == _ids(SAMPLE_MOVEMENTS)
+        assert _ids(data_access.get_top_movements(limit=1)) == ["mv_2"]
+        
+        # Duplicate IDs within one batch keep the last copy
+        data_access.add_movements([_make_movement(5, "youtube", 1.0, 10, 0.1, 1.0, "Old"),
+                                   _make_movement(5, "youtube", 2.0, 10, 0.1, 1.0, "New")])
+        assert [m["title"] for m in data_access.get_all_movements()[5:]] == ["New"]
+        assert _ids(data_access.search_movements(["old"])) == []
+        
+        data_access.flush()
+
+        reloaded = ViralMovementsDataAccess(data_access.data_file)
+        assert _ids(reloaded.get_top_movements(limit=1)) == ["mv_2"]
+        assert reloaded.get_summary()["statistics"]["total_movements"] == len(SAMPLE_MOVEMENTS) + 1
+        print("✓ Updates persisted")
+
+
+def test_saves_are_debounced():
+    """Test bursts of writes coalesce into one save that flush() forces out"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = ViralMovementsDataAccess(os.path.join(tmp_dir, "movements.json"))
+        data_access.FLUSH_DELAY = 60
+        for movement in SAMPLE_MOVEMENTS:
+            data_access.add_movements([movement])
+        assert not os.path.exists(data_access.data_file)
+        
+        data_access.flush()
+        assert _ids(ViralMovementsDataAccess(data_access.data_file).get_all_movements()) == _ids(SAMPLE_MOVEMENTS)
+        
+        # Without an explicit flush the timer saves once the delay passes
+        data_access.FLUSH_DELAY = 0.05
+        data_access.clear_data()
+        for _ in range(100):
+            if ViralMovementsDataAccess(data_access.data_file).get_all_movements() == []:
+                break
+            time.sleep(0.05)
+        assert ViralMovementsDataAccess(data_access.data_file).get_all_movements() == []
+        print("✓ Saves debounced")
+
+
+def test_export_movements():
+    """Test JSON and CSV exports, including the export_clips alias"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = _data_access(tmp_dir)
+        json_file = os.path.join(tmp_dir, "export.json")
+        csv_file = os.path.join(tmp_dir, "export.csv")
+        
+        assert data_access.export_clips(json_file, filters={"platform": "youtube"})
+        with open(json_file, encoding="utf-8") as f:
+            assert _ids(json.load(f)["movements"]) == ["mv_0", "mv_3"]
+        
+        assert data_access.export_movements(csv_file, format="csv", filters={"min_score": 15})
+        with open(csv_file, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["id"] for row in rows] == ["mv_0", "mv_1", "mv_3"]
+        assert rows[0]["final_score"] == "22.3" and "scores" not in rows[0]
+        data_access.flush()
+        print("✓ Exports working")
+
+
+def test_stream_filter_matches_in_memory():
+    """Test streaming filters over the data file agree with the loaded store."""
+    queries = [
+        {},
+        {"platform": "tiktok"},
+        {"min_score": 10, "max_score": 20, "limit": 2},
+        {"min_growth": 3.0, "keywords": ["gaming", "meme"]},
+        {"limit": 0},
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = _data_access(tmp_dir)
+        data_access.flush()
+        for filters in queries:
+            expected = _ids(data_access.filter_movements(**filters))
+            assert _ids(stream_filter_movements(data_access.data_file, **filters)) == expected
+        assert stream_filter_movements(os.path.join(tmp_dir, "missing.json")) == []
+        print("✓ Streaming filters working")
+
+
+def test_sqlite_store_persists_movements():
+    """Test the SQLite-backed store round-trips movements across connections."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_access = _data_access(tmp_dir, SQLiteMovementsDataAccess)
+        data_access.add_movements([_make_movement(2, "instagram", 30.0, 95000, 2.9, 18.5, "Pro Gamer")])
+        data_access.close()
+
+        reloaded = SQLiteMovementsDataAccess(data_access.db_file)
+        # Replaced rows keep their position, as in the JSON-backed store
+        assert _ids(reloaded.get_all_movements()) == ["mv_0", "mv_1", "mv_2", "mv_3", "mv_4"]
+        assert reloaded.get_top_movements(limit=1)[0]["scores"]["final_score"] == 30.0
+        assert reloaded.get_summary()["statistics"]["total_movements"] == len(SAMPLE_MOVEMENTS)
+
+        # Keyword index follows replaced rows; short keywords bypass the trigram index
+        assert _ids(reloaded.search_movements(["highlights"])) == []
+        assert _ids(reloaded.search_movements(["any%", "zz"])) == ["mv_3"]
+        assert _ids(reloaded.search_movements(["Pr"])) == ["mv_2"]
+
+        reloaded.clear_data()
+        assert reloaded.get_all_movements() == []
+        reloaded.close()
+        print("✓ SQLite store persisted")
+
+
+if __name__ == "__main__":
+    test_filter_movements()
+    test_filter_movements_limit()
+    test_add_movements_replaces_existing_id()
+    test_saves_are_debounced()
+    test_export_movements()
+    test_stream_filter_matches_in_memory()
+    test_sqlite_store_persists_movements()
+    print("\nAll data access tests passed! ✅")
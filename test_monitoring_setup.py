@@ -1,12 +1,15 @@
 """Test script to verify monitoring system setup."""
 import sys
 import os
+import tempfile
+from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from monitoring.core import monitoring_system, ensure_initialized
 from monitoring.event_bus import event_bus
-from monitoring.database import db_manager
+from monitoring.database import db_manager, DatabaseManager
 from monitoring.config import config_manager
+from monitoring.decorators import monitor_all, monitor_execution, track_performance, progress_step
 
 
 def test_basic_setup():
@@ -31,6 +34,7 @@ def test_basic_setup():
     
     event_bus.subscribe('test.event', test_handler)
     event_bus.publish('test.event', {'message': 'test'})
+    assert event_bus.drain(), "Queued handlers should finish"
     
     assert len(events_received) == 1, "Should receive one event"
     assert events_received[0][0] == 'test.event', "Event type should match"
@@ -39,6 +43,7 @@ def test_basic_setup():
     # Test database
     stats = db_manager.get_database_stats()
     assert 'log_entries_count' in stats, "Database stats should include log entries count"
+    assert stats == db_manager.get_database_stats(verify=True), "Row counters should match COUNT(*)"
     print("✓ Database operational")
     
     # Test system status
@@ -50,9 +55,66 @@ def test_basic_setup():
     return True
 
 
+def test_disabled_decorators_return_function():
+    """Test decorators leave functions unwrapped while monitoring is disabled."""
+    def step():
+        return 42
+    
+    config = config_manager.get_config()
+    config.enabled = False
+    try:
+        for decorator in (monitor_execution, track_performance, progress_step(), monitor_all()):
+            assert decorator(step) is step, "Disabled monitoring should not wrap functions"
+    finally:
+        config.enabled = True
+    
+    assert monitor_all()(step) is not step, "Enabled monitoring should wrap functions"
+    print("✓ Disabled decorators are free")
+    return True
+
+
+def test_monitor_all_adds_missing_layers():
+    """Test monitor_all over an existing layer records each call once."""
+    def step():
+        return 42
+    
+    started = []
+    with event_bus.subscription(['function.started'], lambda event_type, data: started.append(data), sync=True):
+        assert monitor_all()(monitor_execution(step))() == 42
+    assert len(started) == 1, "Execution should be recorded once"
+    print("✓ Layered decorators record once")
+    return True
+
+
+def test_failed_flush_keeps_buffered_rows():
+    """Test rows from a failed batch write are retried by the next flush."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = DatabaseManager(os.path.join(tmp_dir, 'monitoring.db'))
+        manager._conn.execute("DROP TABLE performance_metrics")
+        manager.record_log(datetime.now(), 'session', 'step', 'complete', duration=0.1)
+        manager.record_performance(datetime.now(), 'step', 0.1, 1024)
+        try:
+            manager.flush()
+            assert False, "Writing to a missing table should fail"
+        except Exception:
+            pass
+        
+        manager._init_database()
+        manager.flush()
+        counts = manager._conn.execute(
+            "SELECT (SELECT COUNT(*) FROM log_entries), (SELECT COUNT(*) FROM performance_metrics)").fetchone()
+        assert tuple(counts) == (1, 1), "Failed batch should be written by the next flush"
+        manager.close()
+    print("✓ Failed flush keeps buffered rows")
+    return True
+
+
 if __name__ == "__main__":
     try:
         test_basic_setup()
+        test_disabled_decorators_return_function()
+        test_monitor_all_adds_missing_layers()
+        test_failed_flush_keeps_buffered_rows()
         print("\nMonitoring system core infrastructure is ready!")
     except Exception as e:
         print(f"\nTest failed: {e}")
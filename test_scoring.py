@@ -0,0 +1,57 @@
+"""Tests that the vectorized virality score matches the original per-clip formula."""
+import sys
+import os
+import math
+import tempfile
+import importlib
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# (views_last_24h, likes, comments, shares, views)
+CASES = [
+    (0, 0, 0, 0, 0),
+    (500, 10, 2, 1, 0),
+    (0, 5, 1, 0, 100),
+    (1200, 340, 56, 78, 10000),
+    (999999, 12000, 3400, 2100, 2500000),
+]
+
+
+def scalar_virality(views_last_24h, likes, comments, shares, views):
+    """The per-clip formula calculate_virality used before it was vectorized."""
+    if views == 0: return 0.0
+    return math.log10(views_last_24h + 1) * ((likes + comments + shares) / views)
+
+
+def _import_main():
+    """Import main from a scratch directory; it opens its history database on import."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            return importlib.import_module('main')
+        finally:
+            os.chdir(cwd)
+
+
+def test_virality_matches_scalar_formula():
+    """Test the uncompiled batch kernel and the scalar wrapper against the original formula."""
+    main = _import_main()
+    # Numba dispatchers keep the Python function; without numba maybe_njit returns it as is
+    kernel = getattr(main.calculate_virality_batch, 'py_func', main.calculate_virality_batch)
+    columns = [np.array(column, dtype=np.float64) for column in zip(*CASES)]
+    expected = [scalar_virality(*case) for case in CASES]
+
+    assert np.allclose(kernel(*columns), expected), "Batch kernel should match the scalar formula"
+    for case, value in zip(CASES, expected):
+        result = main.calculate_virality(*case)
+        assert isinstance(result, float), "Scalar wrapper should return a float"
+        assert math.isclose(result, value), f"Scalar wrapper should match the formula for {case}"
+    print("✓ Virality kernel matches the scalar formula")
+
+
+if __name__ == "__main__":
+    test_virality_matches_scalar_formula()
+    print("\nAll scoring tests passed! ✅")
@@ -0,0 +1,59 @@
+"""Tests that the usage examples import and every demo runs to completion."""
+import sys
+import os
+import io
+import copy
+import contextlib
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import usage_examples
+
+DEMOS = [
+    usage_examples.demo_data_filtering,
+    usage_examples.demo_json_data_structure,
+    usage_examples.demo_monitoring_integration,
+    usage_examples.demo_export_options,
+    usage_examples.demo_real_world_usage,
+    usage_examples.demo_api_usage,
+]
+
+
+class _CountingStream(io.StringIO):
+    """StringIO that counts write() calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_demos_write_output_once():
+    """Test each demo runs, reaches stdout in a single write and leaves the shared sample intact."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Demos write their data and export files to the working directory
+        os.chdir(tmp_dir)
+        try:
+            sample = copy.deepcopy(usage_examples._sample_data().get_all_movements())
+            for demo in DEMOS:
+                stream = _CountingStream()
+                with contextlib.redirect_stdout(stream):
+                    demo()
+                assert stream.writes == 1, f"{demo.__name__} should write its output once"
+                assert stream.getvalue().strip(), f"{demo.__name__} should print something"
+            # The demos share one cached sample store and must leave it unchanged
+            assert usage_examples._sample_data().get_all_movements() == sample
+            assert not usage_examples._sample_data()._dirty, "Sample store should have no pending save"
+        finally:
+            os.chdir(cwd)
+    print("✓ Usage demos run with buffered output")
+
+
+if __name__ == "__main__":
+    test_demos_write_output_once()
+    print("\nAll usage example tests passed! ✅")
@@ -2,50 +2,82 @@
 Usage Examples for Viral Clip Analyzer with Monitoring
 Demonstrates all key features and data access patterns
 """
+import contextlib
+import functools
+import io
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from data_access import ViralClipDataAccess, create_sample_data
+from data_access import ViralMovementsDataAccess, create_sample_data
 from monitoring.core import ensure_initialized, monitoring_system
 from monitoring.database import db_manager
 from monitoring.models import LogFilters, TimeRange
 
 
+def _buffered_output(demo):
+    """Collect a demo's printed output and write it to stdout in one call."""
+    @functools.wraps(demo)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return demo(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def _sample_data():
+    """Sample data store shared by the demos, which only read from it.
+    
+    Saved at once rather than by the debounced saver, so the file lands in the
+    working directory the store was created in.
+    """
+    data_access = create_sample_data()
+    data_access.flush()
+    return data_access
+
+
+@_buffered_output
 def demo_data_filtering():
     """Demonstrate various data filtering options"""
     print("🔍 DATA FILTERING EXAMPLES")
     print("=" * 40)
     
     # Initialize with sample data
-    data_access = create_sample_data()
+    data_access = _sample_data()
     
     print("1. Filter by Score Range:")
-    high_score_clips = data_access.filter_clips(min_score=18, max_score=25)
+    high_score_clips = data_access.filter_movements(min_score=18, max_score=25)
     for clip in high_score_clips:
         print(f"   • {clip['title']} - Score: {clip['scores']['final_score']}")
     
     print(f"\n2. Filter by Platform:")
     platforms = ['youtube', 'tiktok', 'instagram']
     for platform in platforms:
-        clips = data_access.filter_clips(platform=platform)
+        clips = data_access.filter_movements(platform=platform)
         print(f"   • {platform.title()}: {len(clips)} clips")
     
     print(f"\n3. Filter by Views:")
-    high_view_clips = data_access.filter_clips(min_views=200000)
+    high_view_clips = data_access.filter_movements(min_views=200000)
     for clip in high_view_clips:
         print(f"   • {clip['title']} - Views: {clip['views']:,}")
     
     print(f"\n4. Filter by Growth Rate:")
-    trending_clips = data_access.filter_clips(min_growth=3.5)
+    trending_clips = data_access.filter_movements(min_growth=3.5)
     for clip in trending_clips:
         print(f"   • {clip['title']} - Growth: {clip['growth_6h']:.1f}x")
     
     print(f"\n5. Search by Keywords:")
-    gaming_clips = data_access.filter_clips(keywords=['gaming'])
+    gaming_clips = data_access.filter_movements(keywords=['gaming'])
     for clip in gaming_clips:
         print(f"   • {clip['title']} - Platform: {clip['platform']}")
     
     print(f"\n6. Complex Filter (High score + Recent + Gaming):")
-    complex_filter = data_access.filter_clips(
+    complex_filter = data_access.filter_movements(
         min_score=15,
         max_age_hours=24,
         keywords=['gaming'],
@@ -54,12 +86,13 @@ def demo_data_filtering():
     print(f"   Found {len(complex_filter)} clips matching all criteria")
 
 
+@_buffered_output
 def demo_json_data_structure():
     """Show the JSON data structure and key-value format"""
     print("\n📋 JSON DATA STRUCTURE")
     print("=" * 30)
     
-    data_access = ViralClipDataAccess()
+    data_access = ViralMovementsDataAccess()
     
     # Show the complete data structure
     sample_structure = {
@@ -115,6 +148,7 @@ def demo_json_data_structure():
         print(f"   • {key}")
 
 
+@_buffered_output
 def demo_monitoring_integration():
     """Demonstrate monitoring system integration"""
     print("\n📊 MONITORING INTEGRATION")
@@ -129,7 +163,7 @@ def demo_monitoring_integration():
     print(f"Database Entries: {status['database_stats']['log_entries_count']}")
     
     # Get recent performance data
-    data_access = ViralClipDataAccess()
+    data_access = ViralMovementsDataAccess()
     perf_summary = data_access.get_performance_summary()
     
     if "error" not in perf_summary:
@@ -146,12 +180,13 @@ def demo_monitoring_integration():
                 print(f"   • {func}: {stats['avg_time']:.3f}s avg ({stats['calls']} calls)")
 
 
+@_buffered_output
 def demo_export_options():
     """Demonstrate data export capabilities"""
     print("\n💾 EXPORT OPTIONS")
     print("=" * 20)
     
-    data_access = create_sample_data()
+    data_access = _sample_data()
     
     # Export all data
     success = data_access.export_clips("all_clips.json", format="json")
@@ -182,15 +217,16 @@ def demo_export_options():
             print(f"   • {file} ({size:,} bytes)")
 
 
+@_buffered_output
 def demo_real_world_usage():
     """Show real-world usage patterns"""
     print("\n🚀 REAL-WORLD USAGE PATTERNS")
     print("=" * 40)
     
-    data_access = create_sample_data()
+    data_access = _sample_data()
     
     print("1. Find clips for reaction video:")
-    reaction_clips = data_access.filter_clips(
+    reaction_clips = data_access.filter_movements(
         min_score=15,           # High viral potential
         max_age_hours=48,       # Recent content
         min_growth=3.0,         # Trending
@@ -201,8 +237,14 @@ def demo_real_world_usage():
     
     print(f"\n2. Platform comparison:")
     platforms = {}
-    for platform in ['youtube', 'tiktok', 'instagram']:
-        clips = data_access.filter_clips(platform=platform, min_score=15)
+    platform_names = ['youtube', 'tiktok', 'instagram']
+    # The per-platform filters are independent reads, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(platform_names)) as executor:
+        platform_clips = executor.map(
+            lambda platform: data_access.filter_movements(platform=platform, min_score=15),
+            platform_names
+        )
+    for platform, clips in zip(platform_names, platform_clips):
         avg_score = sum(c['scores']['final_score'] for c in clips) / len(clips) if clips else 0
         platforms[platform] = {'count': len(clips), 'avg_score': avg_score}
     
@@ -210,15 +252,16 @@ def demo_real_world_usage():
         print(f"   • {platform.title()}: {stats['count']} clips, avg score: {stats['avg_score']:.1f}")
     
     print(f"\n3. Trending analysis:")
-    all_clips = data_access.get_all_clips()
+    all_clips = data_access.get_all_movements()
     trending_count = len([c for c in all_clips if c['growth_6h'] >= 3.0])
     high_score_count = len([c for c in all_clips if c['scores']['final_score'] >= 18])
     
     print(f"   • Trending clips (>3x growth): {trending_count}")
     print(f"   • High-score clips (>18): {high_score_count}")
-    print(f"   • Overlap (trending + high-score): {len(data_access.filter_clips(min_growth=3.0, min_score=18))}")
+    print(f"   • Overlap (trending + high-score): {len(data_access.filter_movements(min_growth=3.0, min_score=18))}")
 
 
+@_buffered_output
 def demo_api_usage():
     """Show how to use the data access API"""
     print("\n🔧 API USAGE EXAMPLES")
@@ -227,12 +270,12 @@ def demo_api_usage():
     print("Python Code Examples:")
     
     code_examples = [
-        ("Initialize data access", "data_access = ViralClipDataAccess()"),
-        ("Get top clips", "top_clips = data_access.get_top_clips(limit=10)"),
-        ("Filter by platform", "youtube_clips = data_access.get_clips_by_platform('youtube')"),
-        ("Search by keywords", "gaming_clips = data_access.search_clips(['gaming', 'funny'])"),
-        ("Get trending clips", "trending = data_access.get_trending_clips(growth_threshold=3.0)"),
-        ("Complex filtering", "clips = data_access.filter_clips(min_score=15, platform='youtube', limit=5)"),
+        ("Initialize data access", "data_access = ViralMovementsDataAccess()"),
+        ("Get top clips", "top_clips = data_access.get_top_movements(limit=10)"),
+        ("Filter by platform", "youtube_clips = data_access.get_movements_by_platform('youtube')"),
+        ("Search by keywords", "gaming_clips = data_access.search_movements(['gaming', 'funny'])"),
+        ("Get trending clips", "trending = data_access.get_trending_movements(growth_threshold=3.0)"),
+        ("Complex filtering", "clips = data_access.filter_movements(min_score=15, platform='youtube', limit=5)"),
         ("Export data", "data_access.export_clips('export.json', filters={'min_score': 18})"),
         ("Get summary", "summary = data_access.get_summary()"),
     ]
@@ -267,7 +310,7 @@ if __name__ == "__main__":
         print(f"\n📁 Files created:")
         import os
         files = [
-            "viral_clips_data.json", "sample_export.json", 
+            "viral_movements_data.json", "sample_export.json", 
             "all_clips.json", "high_score_clips.json", "youtube_clips.json"
         ]
         for file in files: